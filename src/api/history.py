@@ -0,0 +1,248 @@
+from datetime import timedelta
+from django.db import connection, transaction
+from django.utils import timezone
+import time
+
+from config import Config
+from scraper.models import ScrapedEvent
+from utils import logger
+from .models import PickKey, OddsHistory
+from .persistence import bulk_insert, aware, event_key, save_event_rows
+
+# Columns of a history row written by `bulk_insert`, in order
+HISTORY_FIELDS = ['key', 'timestamp', 'odds', 'line']
+
+class HistoryStore:
+	'''
+	Appends the price of every pick to `OddsHistory` whenever it changes.
+
+	Picks are coded by the integer ID of their `PickKey`, which leaves the line out, so a
+	moving line stays the history of one pick. A book can offer several lines of a pick at
+	once, so the last recorded odds are kept per key and line, and a row is only appended
+	for a line that is new or whose odds moved since the pick was last scraped. The keys and
+	last odds of an event are loaded from the database the first time it is seen, and
+	forgotten once a cycle leaves it out.
+	'''
+
+	def __init__(self, batch_size: int = None):
+		self.batch_size = batch_size or Config.DB_BATCH_SIZE
+		# Event ID -> (book, market, team, player, outcome) -> key ID
+		self._keys = {}
+		# Event ID -> key ID -> line -> odds of the last scrape
+		self._last = {}
+
+	def record(self, events: list[ScrapedEvent], timestamp=None, event_rows: dict = None) -> int:
+		'''
+		Appends the prices of a cycle's picks that changed since they were last recorded.
+
+		Args:
+			events (list[ScrapedEvent]): The events of the cycle with their books attached.
+			timestamp (datetime): When the prices were scraped, now by default.
+			event_rows (dict): The cycle's rows from `save_event_rows`, saved here if None.
+
+		Returns:
+			int: The number of rows appended.
+		'''
+		start_time = time.perf_counter()
+		timestamp = connection.ops.adapt_datetimefield_value(timestamp or timezone.now())
+		events = [e for e in events if e.books]
+		try:
+			with transaction.atomic():
+				rows = self._write(events, timestamp, event_rows)
+		except Exception:
+			self.reset()
+			raise
+
+		logger.info(f'Recorded {len(rows)} price changes in {time.perf_counter() - start_time:.3f}s')
+		return len(rows)
+
+	def reset(self):
+		'''
+		Forgets the recorded keys and odds, which are loaded again from the database as events are recorded.
+		'''
+		self._keys.clear()
+		self._last.clear()
+
+	def _write(self, events, timestamp, event_rows):
+		if event_rows is None:
+			event_rows = save_event_rows(events, self.batch_size)
+		scraped = {}
+		for e in events:
+			event_id = event_rows[event_key(e.league, e.away_team, e.home_team, aware(e.start_time))].id
+			scraped.setdefault(event_id, []).extend(e.books)
+		# Events that finished or left the schedule are not recorded again
+		for event_id in self._last.keys() - scraped.keys():
+			del self._last[event_id]
+			del self._keys[event_id]
+		self._load(scraped.keys())
+
+		current = {}
+		for event_id, books in scraped.items():
+			picks = []
+			for book in books:
+				for pick in book.picks:
+					key = (book.book_name, pick.market, pick.team or '', pick.player or '', pick.outcome or '')
+					picks.append((key, pick.line, pick.odds))
+			current[event_id] = picks
+		self._create_keys(current)
+
+		rows = []
+		for event_id, picks in current.items():
+			keys = self._keys[event_id]
+			last = self._last[event_id]
+			offered = {}
+			for key, line, odds in picks:
+				key_id = keys[key]
+				offered.setdefault(key_id, {})[line] = odds
+				if last.get(key_id, {}).get(line) != odds:
+					rows.append((key_id, timestamp, odds, line))
+			# Picks of a book missing from this cycle keep their odds, while a line that is
+			# no longer offered for a scraped pick is recorded again when it comes back
+			last.update(offered)
+
+		bulk_insert(OddsHistory, HISTORY_FIELDS, rows, self.batch_size)
+		return rows
+
+	def _load(self, event_ids):
+		event_ids = [event_id for event_id in event_ids if event_id not in self._last]
+		for i in range(0, len(event_ids), self.batch_size):
+			batch = event_ids[i:i + self.batch_size]
+			keys = PickKey.objects.filter(event_id__in=batch).values_list(
+				'id', 'event_id', 'book', 'market', 'team', 'player', 'outcome'
+			)
+			for event_id in batch:
+				self._keys[event_id] = {}
+				self._last[event_id] = {}
+			event_of = {}
+			for key_id, event_id, *key in keys:
+				self._keys[event_id][tuple(key)] = key_id
+				event_of[key_id] = event_id
+
+			# Later rows overwrite earlier ones, leaving the last odds of every line
+			history = OddsHistory.objects.filter(key__event_id__in=batch).order_by('timestamp', 'id')
+			for key_id, line, odds in history.values_list('key_id', 'line', 'odds').iterator():
+				self._last[event_of[key_id]].setdefault(key_id, {})[line] = odds
+
+	def _create_keys(self, current):
+		# A set, so a pick offered at several lines is only created once
+		created = [
+			PickKey(event_id=event_id, book=book, market=market, team=team, player=player, outcome=outcome)
+			for event_id, picks in current.items()
+			for book, market, team, player, outcome in {key for key, _, _ in picks} - self._keys[event_id].keys()
+		]
+		PickKey.objects.bulk_create(created, batch_size=self.batch_size)
+		for key in created:
+			self._keys[key.event_id][(key.book, key.market, key.team, key.player, key.outcome)] = key.id
+
+def _time_range(history, start, end):
+	if start is not None:
+		history = history.filter(timestamp__gte=start)
+	if end is not None:
+		history = history.filter(timestamp__lt=end)
+	return history.order_by('timestamp', 'id')
+
+def pick_history(key_id: int, start=None, end=None):
+	'''
+	Returns the recorded prices of one pick between `start` and `end`, oldest first.
+
+	Args:
+		key_id (int): The ID of the pick's `PickKey`.
+		start (datetime): The earliest time to include, unbounded if None.
+		end (datetime): The time to stop before, unbounded if None.
+
+	Returns:
+		QuerySet: The `timestamp`, `odds` and `line` of every recorded price.
+	'''
+	history = OddsHistory.objects.filter(key_id=key_id)
+	return _time_range(history, start, end).values('timestamp', 'odds', 'line')
+
+def event_history(event_id: int, start=None, end=None):
+	'''
+	Returns the recorded prices of every pick of an event between `start` and `end`, oldest first.
+
+	Args:
+		event_id (int): The ID of the event.
+		start (datetime): The earliest time to include, unbounded if None.
+		end (datetime): The time to stop before, unbounded if None.
+
+	Returns:
+		QuerySet: The key of the pick, `timestamp`, `odds` and `line` of every recorded price.
+	'''
+	history = OddsHistory.objects.filter(key__event_id=event_id)
+	return _time_range(history, start, end).values(
+		'key_id', 'key__book', 'key__market', 'key__team', 'key__player', 'key__outcome', 'timestamp', 'odds', 'line',
+	)
+
+def compact_history(downsample_after: timedelta, interval: timedelta, retention: timedelta,
+					batch_size: int = None) -> dict[str, int]:
+	'''
+	Deletes history older than `retention` and downsamples history older than `downsample_after`.
+
+	A downsampled line keeps only its last price in every `interval`, and drops that price
+	too if it equals the one kept before it for the line and no other line of the pick was
+	kept in between, which would make the pick's return to the line a change of its own.
+	Downsampling the same rows again removes nothing.
+
+	Args:
+		downsample_after (timedelta): The age from which history is downsampled.
+		interval (timedelta): The resolution of downsampled history.
+		retention (timedelta): The age from which history is deleted.
+		batch_size (int): The most rows deleted per query.
+
+	Returns:
+		dict: The number of rows expired and downsampled.
+	'''
+	start_time = time.perf_counter()
+	batch_size = batch_size or Config.DB_BATCH_SIZE
+	now = timezone.now()
+	expired, _ = OddsHistory.objects.filter(timestamp__lt=now - retention).delete()
+
+	seconds = interval.total_seconds()
+	history = OddsHistory.objects.filter(
+		timestamp__gte=now - retention, timestamp__lt=now - downsample_after
+	).order_by('key_id', 'timestamp', 'id')
+	dropped = []
+	current_key = None
+	# (row ID, line, bucket, odds) of every row of the current key, oldest first
+	rows = []
+
+	def downsample():
+		# (bucket, line) -> index of the last row in it, so earlier rows of a bucket are dropped
+		last = {}
+		for i, (row_id, line, bucket, _) in enumerate(rows):
+			previous = last.get((bucket, line))
+			if previous is not None:
+				dropped.append(rows[previous][0])
+			last[(bucket, line)] = i
+
+		# Line -> (odds, position) of the last row kept, a row is only a duplicate of the row
+		# kept right before it
+		kept = {}
+		count = 0
+		for i in sorted(last.values()):
+			row_id, line, _, odds = rows[i]
+			if kept.get(line) == (odds, count - 1):
+				dropped.append(row_id)
+			else:
+				kept[line] = (odds, count)
+				count += 1
+		rows.clear()
+
+	for row_id, key_id, line, timestamp, odds in history.values_list(
+		'id', 'key_id', 'line', 'timestamp', 'odds'
+	).iterator(chunk_size=batch_size):
+		if key_id != current_key:
+			downsample()
+			current_key = key_id
+		rows.append((row_id, line, int(timestamp.timestamp() // seconds), odds))
+	downsample()
+
+	with transaction.atomic():
+		for i in range(0, len(dropped), batch_size):
+			OddsHistory.objects.filter(id__in=dropped[i:i + batch_size]).delete()
+
+	logger.info(
+		f'Compacted odds history: {expired} rows expired and {len(dropped)} downsampled '
+		f'in {time.perf_counter() - start_time:.3f}s'
+	)
+	return {'expired': expired, 'downsampled': len(dropped)}
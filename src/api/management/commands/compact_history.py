@@ -0,0 +1,21 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+
+from config import Config
+from api.history import compact_history
+
+class Command(BaseCommand):
+	help = 'Deletes expired odds history and downsamples old odds history.'
+
+	def add_arguments(self, parser):
+		parser.add_argument('--downsample-after', type=float, default=Config.HISTORY_DOWNSAMPLE_AFTER, help='Hours')
+		parser.add_argument('--interval', type=float, default=Config.HISTORY_DOWNSAMPLE_INTERVAL, help='Minutes')
+		parser.add_argument('--retention', type=float, default=Config.HISTORY_RETENTION, help='Days')
+
+	def handle(self, *args, **options):
+		counts = compact_history(
+			timedelta(hours=options['downsample_after']),
+			timedelta(minutes=options['interval']),
+			timedelta(days=options['retention']),
+		)
+		self.stdout.write(f'{counts["expired"]} rows expired, {counts["downsampled"]} rows downsampled')
@@ -0,0 +1,25 @@
+# Generated by Django 5.1 on 2026-10-18 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='league',
+            field=models.CharField(default='', max_length=100),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='pick',
+            name='market',
+            field=models.CharField(default='', max_length=100),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.1 on 2026-10-18 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_event_league_pick_market'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PickKey',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('book', models.CharField(max_length=100)),
+                ('market', models.CharField(max_length=100)),
+                ('team', models.CharField(blank=True, default='', max_length=100)),
+                ('player', models.CharField(blank=True, default='', max_length=100)),
+                ('outcome', models.CharField(blank=True, default='', max_length=100)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pick_keys', to='api.event')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('event', 'book', 'market', 'team', 'player', 'outcome'), name='unique_pick_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='OddsHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('timestamp', models.DateTimeField()),
+                ('odds', models.IntegerField()),
+                ('line', models.FloatField(blank=True, null=True)),
+                ('key', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='history', to='api.pickkey')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['key', 'timestamp'], name='odds_history_key_time'), models.Index(fields=['timestamp'], name='odds_history_time')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1 on 2026-10-18 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_pickkey_oddshistory'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='pick',
+            name='sportsbook',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='picks', to='api.sportsbook'),
+        ),
+        migrations.AlterField(
+            model_name='pickkey',
+            name='event',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='pick_keys', to='api.event'),
+        ),
+        migrations.AlterField(
+            model_name='oddshistory',
+            name='key',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='history', to='api.pickkey'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['league', 'start_time'], name='event_league_start'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['active'], name='event_active'),
+        ),
+        migrations.AddIndex(
+            model_name='pick',
+            index=models.Index(fields=['sportsbook', 'market'], name='pick_book_market'),
+        ),
+        migrations.AddIndex(
+            model_name='pick',
+            index=models.Index(fields=['market', 'team', 'line', 'outcome'], name='pick_market_side'),
+        ),
+    ]
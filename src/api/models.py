@@ -7,16 +7,69 @@ class Event(models.Model):
 	start_time = models.DateTimeField()
 	active = models.BooleanField(default=True)
 
+	class Meta:
+		indexes = [
+			# Events of a league by start time, as matched by every save of a cycle
+			models.Index(fields=['league', 'start_time'], name='event_league_start'),
+			models.Index(fields=['active'], name='event_active'),
+		]
+
 class Sportsbook(models.Model):
 	event = models.ForeignKey(Event, related_name='sportsbooks', on_delete=models.CASCADE)
 	title = models.CharField(max_length=100)
 	last_updated = models.DateTimeField(auto_now_add=True)
 
 class Pick(models.Model):
-	sportsbook = models.ForeignKey(Sportsbook, related_name='picks', on_delete=models.CASCADE)
+	# Lookups by sportsbook use the (sportsbook, market) index, a separate one would only slow writes
+	sportsbook = models.ForeignKey(Sportsbook, related_name='picks', on_delete=models.CASCADE, db_index=False)
 	market = models.CharField(max_length=100, null=False)
 	team = models.CharField(max_length=100, null=True, blank=True)
 	line = models.FloatField(null=True, blank=True)
 	odds = models.IntegerField(null=False)
 	player = models.CharField(max_length=100, null=True, blank=True)
-	outcome = models.CharField(max_length=100, null=True, blank=True)
\ No newline at end of file
+	outcome = models.CharField(max_length=100, null=True, blank=True)
+
+	class Meta:
+		indexes = [
+			models.Index(fields=['sportsbook', 'market'], name='pick_book_market'),
+			# Every book's price of the same side and line, for line shopping
+			models.Index(fields=['market', 'team', 'line', 'outcome'], name='pick_market_side'),
+		]
+
+class PickKey(models.Model):
+	'''
+	The integer ID of a pick's natural key, shared by every price the pick has had.
+
+	The line is not part of the key, so a moving line is history of the same pick.
+	'''
+	# Lookups by event use the unique constraint, which starts with it
+	event = models.ForeignKey(Event, related_name='pick_keys', on_delete=models.CASCADE, db_index=False)
+	book = models.CharField(max_length=100)
+	market = models.CharField(max_length=100)
+	# Empty instead of NULL, so the unique constraint also covers picks without them
+	team = models.CharField(max_length=100, blank=True, default='')
+	player = models.CharField(max_length=100, blank=True, default='')
+	outcome = models.CharField(max_length=100, blank=True, default='')
+
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(
+				fields=['event', 'book', 'market', 'team', 'player', 'outcome'], name='unique_pick_key'
+			),
+		]
+
+class OddsHistory(models.Model):
+	'''
+	An append-only record of a pick's price, only written when its odds or line change.
+	'''
+	# Lookups by key use the (key, timestamp) index
+	key = models.ForeignKey(PickKey, related_name='history', on_delete=models.CASCADE, db_index=False)
+	timestamp = models.DateTimeField()
+	odds = models.IntegerField()
+	line = models.FloatField(null=True, blank=True)
+
+	class Meta:
+		indexes = [
+			models.Index(fields=['key', 'timestamp'], name='odds_history_key_time'),
+			models.Index(fields=['timestamp'], name='odds_history_time'),
+		]
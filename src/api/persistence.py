@@ -0,0 +1,253 @@
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+import time
+
+from config import Config
+from scraper.models import ScrapedEvent
+from utils import logger
+from .models import Event, Sportsbook, Pick
+
+def aware(start_time):
+	# Scraped start times are naive, the database stores them in the default time zone
+	return timezone.make_aware(start_time) if timezone.is_naive(start_time) else start_time
+
+# Columns of a pick row written by `bulk_insert`, in order
+PICK_FIELDS = ['sportsbook', 'market', 'team', 'player', 'line', 'outcome', 'odds']
+
+def bulk_insert(model, fields: list[str], rows: list[tuple], batch_size: int):
+	'''
+	Inserts rows of values into a model's table with one `executemany` per batch.
+
+	Unlike `bulk_create`, no model instances are built and no primary keys are returned.
+	'''
+	quote = connection.ops.quote_name
+	columns = ', '.join(quote(model._meta.get_field(f).column) for f in fields)
+	placeholders = ', '.join(['%s'] * len(fields))
+	sql = f'INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES ({placeholders})'
+	with connection.cursor() as cursor:
+		for i in range(0, len(rows), batch_size):
+			cursor.executemany(sql, rows[i:i + batch_size])
+
+def bulk_set(model, field: str, rows: list[tuple], batch_size: int):
+	'''
+	Sets one field of many rows from (value, primary key) pairs with one `executemany` per batch.
+
+	`bulk_update` resolves a `CASE WHEN` expression per row, which costs more than the update
+	itself once thousands of odds change in a cycle.
+	'''
+	quote = connection.ops.quote_name
+	column = quote(model._meta.get_field(field).column)
+	sql = f'UPDATE {quote(model._meta.db_table)} SET {column} = %s WHERE {quote(model._meta.pk.column)} = %s'
+	with connection.cursor() as cursor:
+		for i in range(0, len(rows), batch_size):
+			cursor.executemany(sql, rows[i:i + batch_size])
+
+def event_key(league, away_team, home_team, start_time):
+	return league, away_team, home_team, start_time
+
+class OddsWriter:
+	'''
+	Writes each cycle's scraped odds to the database, touching only the rows that changed.
+
+	The last written state is kept in memory, keyed by the natural key of every pick:
+	(sportsbook, market, team, player, line, outcome), where a sportsbook row is one book of
+	one event. A cycle is diffed against that state, so only new picks are inserted, picks
+	whose odds moved are updated with `bulk_set` and picks a book no longer offers are
+	deleted, as is a book that is no longer scraped for its event. `Sportsbook.last_updated`
+	is only refreshed for books with a change. The state of an event is loaded from the
+	database the first time the event is written. Once a cycle leaves an event out, it is
+	forgotten, its books and picks are deleted and it is no longer active, while its row and
+	odds history are kept.
+	'''
+
+	def __init__(self, batch_size: int = None):
+		self.batch_size = batch_size or Config.DB_BATCH_SIZE
+		# Event ID -> book name -> sportsbook ID, of every loaded event
+		self._books = {}
+		# Sportsbook ID -> natural key -> (pick ID, odds)
+		self._picks = {}
+
+	def save(self, events: list[ScrapedEvent], event_rows: dict = None) -> dict[str, int]:
+		'''
+		Writes the changes of a cycle's scraped events, books and picks in one transaction.
+
+		Args:
+			events (list[ScrapedEvent]): The events of the cycle with their books attached.
+			event_rows (dict): The cycle's rows from `save_event_rows`, saved here if None.
+
+		Returns:
+			dict: The number of picks inserted, updated and deleted and of books changed and removed.
+		'''
+		start_time = time.perf_counter()
+		events = [e for e in events if e.books]
+		try:
+			with transaction.atomic():
+				rows, inserts, updates, deletes, changed_books, removed_books = self._write(events, event_rows)
+		except Exception:
+			self.reset()
+			raise
+
+		counts = {
+			'inserted': len(inserts), 'updated': len(updates), 'deleted': len(deletes), 'books': len(changed_books),
+			'removed': len(removed_books),
+		}
+		logger.info(
+			f'Saved {len(rows)} events: {counts["inserted"]} picks inserted, {counts["updated"]} updated '
+			f'and {counts["deleted"]} deleted in {counts["books"]} books, {counts["removed"]} books removed '
+			f'in {time.perf_counter() - start_time:.3f}s'
+		)
+		return counts
+
+	def reset(self):
+		'''
+		Forgets the written state, which is loaded again from the database as events are written.
+
+		Needed whenever a write is rolled back, as the state no longer matches the database.
+		'''
+		self._books.clear()
+		self._picks.clear()
+
+	def _write(self, events, rows):
+		if rows is None:
+			rows = save_event_rows(events, self.batch_size)
+		event_ids = {row.id for row in rows.values()}
+		# Events that finished or left the schedule are not written again
+		for event_id in self._books.keys() - event_ids:
+			for sportsbook_id in self._books.pop(event_id).values():
+				self._picks.pop(sportsbook_id, None)
+		self._load(event_ids)
+		scraped = [
+			(rows[event_key(e.league, e.away_team, e.home_team, aware(e.start_time))].id, book)
+			for e in events for book in e.books
+		]
+		self._create_books(scraped)
+
+		inserts, updates, deletes, changed_books = [], [], [], set()
+		# A book no longer scraped for its event is deleted with its picks
+		scraped_books = {(event_id, book.book_name) for event_id, book in scraped}
+		removed_books = []
+		# A cycle without any book, as when every book failed, leaves the database alone
+		if event_ids:
+			removed_books.extend(Sportsbook.objects.exclude(event_id__in=event_ids).values_list('id', flat=True))
+			Event.objects.filter(active=True).exclude(id__in=event_ids).update(active=False)
+		for event_id in event_ids:
+			books = self._books[event_id]
+			for book_name in [name for name in books if (event_id, name) not in scraped_books]:
+				sportsbook_id = books.pop(book_name)
+				deletes.extend(pick_id for pick_id, _ in self._picks.pop(sportsbook_id).values())
+				removed_books.append(sportsbook_id)
+		for event_id, book in scraped:
+			sportsbook_id = self._books[event_id][book.book_name]
+			written = self._picks.setdefault(sportsbook_id, {})
+			current = {}
+			for pick in book.picks:
+				current[(pick.market, pick.team, pick.player, pick.line, pick.outcome)] = pick.odds
+
+			for key, odds in current.items():
+				previous = written.get(key)
+				if previous is None:
+					inserts.append((sportsbook_id, *key, odds))
+				elif previous[1] != odds:
+					updates.append((odds, previous[0]))
+					written[key] = (previous[0], odds)
+				else:
+					continue
+				changed_books.add(sportsbook_id)
+			for key in written.keys() - current.keys():
+				deletes.append(written.pop(key)[0])
+				changed_books.add(sportsbook_id)
+
+		last_id = Pick.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+		bulk_insert(Pick, PICK_FIELDS, inserts, self.batch_size)
+		bulk_set(Pick, 'odds', updates, self.batch_size)
+		for i in range(0, len(deletes), self.batch_size):
+			Pick.objects.filter(id__in=deletes[i:i + self.batch_size]).delete()
+		for i in range(0, len(removed_books), self.batch_size):
+			# Cascades to the picks of books whose event left the cycle
+			Sportsbook.objects.filter(id__in=removed_books[i:i + self.batch_size]).delete()
+		if inserts:
+			# Inserted rows only get their IDs from the database
+			self._load_picks(Pick.objects.filter(id__gt=last_id))
+		changed_books = list(changed_books)
+		for i in range(0, len(changed_books), self.batch_size):
+			Sportsbook.objects.filter(id__in=changed_books[i:i + self.batch_size]).update(
+				last_updated=timezone.now()
+			)
+
+		return rows, inserts, updates, deletes, changed_books, removed_books
+
+	def _load(self, event_ids):
+		event_ids = [event_id for event_id in event_ids if event_id not in self._books]
+		if not event_ids:
+			return
+		for event_id in event_ids:
+			self._books[event_id] = {}
+		sportsbooks = list(Sportsbook.objects.filter(event_id__in=event_ids).values_list('id', 'event_id', 'title'))
+		for sportsbook_id, event_id, title in sportsbooks:
+			self._books[event_id][title] = sportsbook_id
+			self._picks[sportsbook_id] = {}
+		sportsbook_ids = [row[0] for row in sportsbooks]
+		for i in range(0, len(sportsbook_ids), self.batch_size):
+			self._load_picks(Pick.objects.filter(sportsbook_id__in=sportsbook_ids[i:i + self.batch_size]))
+
+	def _load_picks(self, picks):
+		for pick_id, sportsbook_id, market, team, player, line, outcome, odds in picks.values_list('id', *PICK_FIELDS):
+			self._picks.setdefault(sportsbook_id, {})[(market, team, player, line, outcome)] = (pick_id, odds)
+
+	def _create_books(self, scraped):
+		created = []
+		for event_id, book in scraped:
+			if book.book_name not in self._books[event_id]:
+				created.append(Sportsbook(event_id=event_id, title=book.book_name))
+				# Keeps a book scraped twice for one event from being created twice
+				self._books[event_id][book.book_name] = None
+		Sportsbook.objects.bulk_create(created, batch_size=self.batch_size)
+		for sportsbook in created:
+			self._books[sportsbook.event_id][sportsbook.title] = sportsbook.id
+			self._picks[sportsbook.id] = {}
+
+def save_event_rows(events: list[ScrapedEvent], batch_size: int) -> dict[tuple, Event]:
+	'''
+	Returns the row of every scraped event with books by its `event_key`, creating the missing ones.
+
+	Both `OddsWriter` and `HistoryStore` need the rows of a cycle, so a caller running both
+	saves them once and passes them to each.
+	'''
+	keys = {
+		event_key(e.league, e.away_team, e.home_team, aware(e.start_time)): e
+		for e in events if e.books
+	}
+	if not keys:
+		return {}
+
+	existing = Event.objects.filter(
+		league__in={key[0] for key in keys},
+		start_time__in={key[3] for key in keys},
+	)
+	rows = {}
+	changed = []
+	for row in existing:
+		key = event_key(row.league, row.away_team, row.home_team, row.start_time)
+		if key in keys:
+			rows[key] = row
+			if row.active != keys[key].active:
+				row.active = keys[key].active
+				changed.append(row)
+	Event.objects.bulk_update(changed, ['active'], batch_size=batch_size)
+
+	created = [
+		Event(
+			league=event.league,
+			away_team=event.away_team,
+			home_team=event.home_team,
+			start_time=start_time,
+			active=event.active,
+		)
+		for (league, away_team, home_team, start_time), event in keys.items()
+		if (league, away_team, home_team, start_time) not in rows
+	]
+	Event.objects.bulk_create(created, batch_size=batch_size)
+	for row in created:
+		rows[event_key(row.league, row.away_team, row.home_team, row.start_time)] = row
+	return rows
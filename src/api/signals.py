@@ -0,0 +1,27 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from config import Config
+
+JOURNAL_MODES = {'delete', 'truncate', 'persist', 'memory', 'wal', 'off'}
+SYNCHRONOUS_MODES = {'off', 'normal', 'full', 'extra', '0', '1', '2', '3'}
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+	'''
+	Applies the SQLite connection profile from `Config` to every new database connection.
+	'''
+	if connection.vendor != 'sqlite':
+		return
+	# Both are formatted into the PRAGMA, which takes no parameters
+	if Config.DB_JOURNAL_MODE not in JOURNAL_MODES:
+		raise ValueError(f'Journal mode {Config.DB_JOURNAL_MODE} is not supported.')
+	if Config.DB_SYNCHRONOUS not in SYNCHRONOUS_MODES:
+		raise ValueError(f'Synchronous mode {Config.DB_SYNCHRONOUS} is not supported.')
+	with connection.cursor() as cursor:
+		cursor.execute(f'PRAGMA journal_mode = {Config.DB_JOURNAL_MODE}')
+		cursor.execute(f'PRAGMA synchronous = {Config.DB_SYNCHRONOUS}')
+		cursor.execute(f'PRAGMA mmap_size = {Config.DB_MMAP_SIZE}')
+		# A negative cache size is in KiB rather than pages
+		cursor.execute(f'PRAGMA cache_size = -{Config.DB_CACHE_SIZE}')
+		cursor.execute(f'PRAGMA busy_timeout = {Config.DB_BUSY_TIMEOUT}')
@@ -13,7 +13,7 @@ async def event_list(request):
 			'sportsbooks': [
 				{
 					'title': sportsbook.title,
-					'last_update': sportsbook.last_update,
+					'last_updated': sportsbook.last_updated,
 					'picks': [
 						{
 							'market': pick.market,
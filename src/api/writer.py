@@ -0,0 +1,104 @@
+from datetime import datetime
+from queue import Queue, Empty, Full
+from django.db import connection, transaction
+from django.utils import timezone
+import threading
+
+from config import Config
+from scraper.models import ScrapedEvent
+from utils import logger
+from .history import HistoryStore
+from .persistence import OddsWriter, save_event_rows
+
+# Seconds a full queue is waited on before checking that the thread is still running
+PUT_INTERVAL = 1
+
+class DatabaseWriter:
+	'''
+	Writes the scraper's cycles to the database from one dedicated thread.
+
+	Every scraper write goes through the connection of this thread, so writes never wait on
+	each other, and in WAL mode the API keeps reading the last committed state while they run.
+	The scraper only queues a cycle and moves on. Cycles queued while the previous write was
+	running are written together in one transaction, each in its own savepoint, so a cycle
+	that fails is rolled back alone. The queue is bounded, so a scraper that outpaces the
+	database waits instead of piling up cycles in memory. A thread that died is restarted
+	the next time a cycle is queued.
+	'''
+
+	def __init__(self, writer: OddsWriter = None, history: HistoryStore = None, queue_size: int = None):
+		self.writer = writer or OddsWriter()
+		self.history = history or HistoryStore()
+		# (events, scrape time) of every queued cycle, None stops the thread
+		self._queue = Queue(maxsize=queue_size or Config.DB_WRITE_QUEUE_SIZE)
+		self._thread = None
+
+	def start(self):
+		self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+		self._thread.start()
+		return self
+
+	def submit(self, events: list[ScrapedEvent], timestamp: datetime = None):
+		'''
+		Queues a cycle's events to be saved and recorded in the odds history.
+		'''
+		self._put((events, timestamp or timezone.now()))
+
+	def stop(self, timeout: float = None):
+		'''
+		Writes the cycles still queued and stops the thread.
+		'''
+		self._put(None)
+		self._thread.join(timeout)
+
+	def _put(self, item):
+		while True:
+			if not self._thread.is_alive():
+				# The state may not match a write the thread died in, it is loaded again
+				logger.error('Database writer thread died, restarting it')
+				self.writer.reset()
+				self.history.reset()
+				self.start()
+			try:
+				self._queue.put(item, timeout=PUT_INTERVAL)
+				return
+			except Full:
+				continue
+
+	def _run(self):
+		try:
+			while True:
+				batch = [self._queue.get()]
+				while True:
+					try:
+						batch.append(self._queue.get_nowait())
+					except Empty:
+						break
+				cycles = [cycle for cycle in batch if cycle is not None]
+				if cycles:
+					self._write(cycles)
+				if len(cycles) < len(batch):
+					return
+		finally:
+			connection.close()
+
+	def _write(self, cycles):
+		try:
+			with transaction.atomic():
+				for events, timestamp in cycles:
+					try:
+						with transaction.atomic():
+							# Saved once for both the current odds and their history
+							event_rows = save_event_rows(events, self.writer.batch_size)
+							self.writer.save(events, event_rows)
+							self.history.record(events, timestamp, event_rows)
+					except Exception as e:
+						# Only this cycle was rolled back, the next one writes its changes again
+						self.writer.reset()
+						self.history.reset()
+						logger.error(f'Failed to write a cycle: {e}', exc_info=True)
+		except Exception as e:
+			# Failing to commit rolls back every cycle of the batch
+			self.writer.reset()
+			self.history.reset()
+			logger.error(f'Failed to write {len(cycles)} cycle(s): {e}', exc_info=True)
@@ -0,0 +1,41 @@
+from .arbitrage import (
+    american_to_decimal,
+    american_to_decimal_batch,
+    decimal_to_american_batch,
+    is_arbitrage_opportunity,
+    calculate_arbitrage,
+)
+from .snapshot import OddsSnapshot, CodeTable
+from .scanner import Arbitrage, scan_arbitrage
+from .complements import ComplementIndex, market_key, complement_key, group_key
+from .incremental import ArbitrageTracker, ArbitrageChange
+from .middles import Middle, find_middles
+from .feed import OpportunityFeed
+from .ev import PositiveEV, fair_probabilities, find_positive_ev
+from .stakes import Allocation, optimize_stakes
+
+__all__ = [
+    'american_to_decimal',
+    'american_to_decimal_batch',
+    'decimal_to_american_batch',
+    'is_arbitrage_opportunity',
+    'calculate_arbitrage',
+    'OddsSnapshot',
+    'CodeTable',
+    'Arbitrage',
+    'scan_arbitrage',
+    'ComplementIndex',
+    'market_key',
+    'complement_key',
+    'group_key',
+    'ArbitrageTracker',
+    'ArbitrageChange',
+    'Middle',
+    'find_middles',
+    'OpportunityFeed',
+    'PositiveEV',
+    'fair_probabilities',
+    'find_positive_ev',
+    'Allocation',
+    'optimize_stakes',
+]
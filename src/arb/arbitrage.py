@@ -1,6 +1,24 @@
+import numpy as np
+
 def american_to_decimal(american_odds):
     return american_odds / 100 + 1 if american_odds > 0 else \
-           100 / american_odds + 1
+           100 / -american_odds + 1
+
+
+def american_to_decimal_batch(american_odds):
+    '''
+    Converts an array of American odds to decimal odds.
+    '''
+    american_odds = np.asarray(american_odds, dtype=np.float64)
+    return np.where(american_odds > 0, american_odds / 100, 100 / np.abs(american_odds)) + 1
+
+
+def decimal_to_american_batch(decimal_odds):
+    '''
+    Converts an array of decimal odds to American odds.
+    '''
+    decimal_odds = np.asarray(decimal_odds, dtype=np.float64)
+    return np.where(decimal_odds >= 2, (decimal_odds - 1) * 100, -100 / (decimal_odds - 1))
 
 
 def is_arbitrage_opportunity(odds1, odds2):
@@ -21,10 +39,11 @@ def calculate_arbitrage(odds1, odds2, investment):
     ip1 = 1 / odds1
     ip2 = 1 / odds2
 
-    stake1 = investment * ip1
-    stake2 = investment * ip2
+    # Split the investment so either side pays out the same amount
+    stake1 = investment * ip1 / (ip1 + ip2)
+    stake2 = investment * ip2 / (ip1 + ip2)
 
-    profit = (stake1 * odds1) + (stake2 * odds2) - investment
+    profit = stake1 * odds1 - investment
     roi = profit / investment * 100
 
     return { "stake1": stake1, "stake2": stake2, "profit": profit, "roi": roi }
@@ -0,0 +1,142 @@
+from collections import defaultdict
+
+from scraper.models import ScrapedEvent, ScrapedPick
+from utils import OPPOSITE_OUTCOMES
+from .scanner import is_team_market
+
+def _market_team(pick: ScrapedPick) -> str | None:
+    # Picks without an outcome back their team, picks with one only share it with
+    # `team_*` markets, any other team is the row a book listed the pick in
+    if pick.outcome is None or is_team_market(pick.market):
+        return pick.team
+    return None
+
+def market_key(event: ScrapedEvent, pick: ScrapedPick) -> tuple:
+    '''
+    Returns the key of the side of a market a pick backs, shared by the same pick at every book.
+
+    The key is (event ID, market, player, team, line, outcome). Of the picks with an outcome,
+    only `team_*` markets keep their team, so over and under of one team's total are sides
+    of the same market.
+    '''
+    line = None if pick.line is None else pick.line + 0.0
+    return event.id, pick.market, pick.player, _market_team(pick), line, pick.outcome
+
+def complement_key(event: ScrapedEvent, pick: ScrapedPick) -> tuple | None:
+    '''
+    Returns the key of the side that loses when the pick wins, or None if the market
+    has no single opposite side.
+
+    Over/under and other two-way outcomes flip the outcome. Picks on a team without an
+    outcome, moneylines and spreads, flip the team, and spreads also flip the sign of the
+    line so +1.5 on the away team is the complement of -1.5 on the home team.
+    '''
+    if pick.outcome is not None:
+        opposite = OPPOSITE_OUTCOMES.get(pick.outcome)
+        if opposite is None:
+            return None
+        line = None if pick.line is None else pick.line + 0.0
+        return event.id, pick.market, pick.player, _market_team(pick), line, opposite
+
+    if pick.team == event.home_team:
+        team = event.away_team
+    elif pick.team == event.away_team:
+        team = event.home_team
+    else:
+        return None
+    line = None if pick.line is None else -pick.line + 0.0
+    return event.id, pick.market, pick.player, team, line, None
+
+def group_key(event: ScrapedEvent, pick: ScrapedPick) -> tuple[tuple, str]:
+    '''
+    Returns the key of the market group a pick belongs to and the side it backs in it.
+
+    A group holds every side of one market, (event ID, market, player, team, line). Picks
+    with an outcome back the outcome and only keep their team in `team_*` markets. Picks on a team
+    without an outcome back the team, and their line is taken from the home team's point
+    of view so both sides of a spread share a group. This is the grouping `scan_arbitrage` uses.
+    '''
+    line = None if pick.line is None else pick.line + 0.0
+    if pick.outcome is not None:
+        return (event.id, pick.market, pick.player, _market_team(pick), line), pick.outcome
+    if line is not None and pick.team != event.home_team:
+        line = -line + 0.0
+    return (event.id, pick.market, pick.player, None, line), pick.team
+
+class ComplementIndex:
+    '''
+    The picks of every book indexed by the side they back, so the counter-sides of a pick
+    are found with one lookup instead of comparing it against every other pick.
+    '''
+
+    def __init__(self):
+        # Side key -> book name -> pick
+        self._sides = defaultdict(dict)
+        # Side key -> complement key, kept since the event is needed to compute it
+        self._complements = {}
+
+    @classmethod
+    def from_events(cls, events: list[ScrapedEvent]) -> 'ComplementIndex':
+        index = cls()
+        for event in events:
+            for book in event.books:
+                for pick in book.picks:
+                    index.add(event, book.book_name, pick)
+        return index
+
+    def add(self, event: ScrapedEvent, book_name: str, pick: ScrapedPick) -> tuple:
+        '''
+        Adds a book's pick, replacing the book's previous price for the same side.
+        '''
+        key = market_key(event, pick)
+        self._sides[key][book_name] = pick
+        if key not in self._complements:
+            self._complements[key] = complement_key(event, pick)
+        return key
+
+    def remove(self, event: ScrapedEvent, book_name: str, pick: ScrapedPick):
+        key = market_key(event, pick)
+        books = self._sides.get(key)
+        if books is not None:
+            books.pop(book_name, None)
+            if not books:
+                del self._sides[key]
+                del self._complements[key]
+
+    def get(self, key: tuple) -> dict[str, ScrapedPick]:
+        '''
+        Returns the pick of every book offering a side.
+        '''
+        return self._sides.get(key, {})
+
+    def counter_sides(self, event: ScrapedEvent, pick: ScrapedPick) -> dict[str, ScrapedPick]:
+        '''
+        Returns the pick of every book offering the side opposite to a pick.
+        '''
+        key = complement_key(event, pick)
+        return {} if key is None else self.get(key)
+
+    def best(self, key: tuple) -> tuple[str, ScrapedPick] | None:
+        '''
+        Returns the book with the highest odds for a side and its pick.
+        '''
+        books = self.get(key)
+        if not books:
+            return None
+        return max(books.items(), key=lambda item: item[1].odds)
+
+    def pairs(self):
+        '''
+        Yields every pair of side keys that are complements of each other, once per pair.
+        '''
+        seen = set()
+        for key, complement in self._complements.items():
+            if complement is not None and complement in self._sides and complement not in seen:
+                seen.add(key)
+                yield key, complement
+
+    def __contains__(self, key):
+        return key in self._sides
+
+    def __len__(self):
+        return len(self._sides)
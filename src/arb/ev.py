@@ -0,0 +1,158 @@
+import numpy as np
+
+from scraper.models import ScrapedEvent
+from .arbitrage import decimal_to_american_batch
+from .scanner import group_outcomes, market_groups
+from .snapshot import OddsSnapshot
+
+class PositiveEV:
+    '''
+    A book's price that pays more than the consensus fair probability of its side is worth.
+    '''
+
+    def __init__(self, event: ScrapedEvent, market: str, player: str, pick: dict,
+                 fair_probability: float, fair_odds: int, edge: float, books: int):
+        self.event = event
+        self.market = market
+        self.player = player
+        self.pick = pick
+        self.fair_probability = fair_probability
+        self.fair_odds = fair_odds
+        # Expected profit per unit staked, in percent
+        self.edge = edge
+        # Books the consensus was taken from
+        self.books = books
+
+    def __str__(self):
+        side = self.pick['outcome'] or self.pick['team']
+        return (
+            f'{self.event} {self.player or ""} {self.market} {side} {self.pick["line"]}: '
+            f'{self.pick["book"]} {self.pick["odds"]} vs. fair {self.fair_odds} ({self.edge:.2f}%)'
+        )
+
+    def to_dict(self):
+        return {
+            'event_id': self.event.id,
+            'event': str(self.event),
+            'market': self.market,
+            'player': self.player,
+            'pick': self.pick,
+            'fair_probability': self.fair_probability,
+            'fair_odds': self.fair_odds,
+            'edge': self.edge,
+            'books': self.books,
+        }
+
+def _group_median(ids, values, n):
+    if len(values) == 0:
+        # E.g. the consensus book is missing from the cycle, no group has a median
+        return np.full(n, np.nan), np.zeros(n, dtype=np.int64)
+    # Sort by group then value, and take the middle one or two values of every group
+    order = np.lexsort((values, ids))
+    sorted_values = values[order]
+    counts = np.bincount(ids, minlength=n)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    lower = sorted_values[np.minimum(starts + (counts - 1) // 2, len(values) - 1)]
+    upper = sorted_values[np.minimum(starts + counts // 2, len(values) - 1)]
+    return np.where(counts > 0, (lower + upper) / 2, np.nan), counts
+
+def fair_probabilities(snapshot: OddsSnapshot, consensus: str = 'median'):
+    '''
+    Computes the no-vig consensus probability of every side of every market group.
+
+    The vig is removed from each book that prices every side of a group by normalizing its
+    implied probabilities to sum to 1. The consensus of a side is the median of those fair
+    probabilities across books, or the fair probability of one book, e.g. the sharpest one.
+    Consensus probabilities are normalized again so the sides of a group sum to 1.
+
+    Args:
+        snapshot (OddsSnapshot): The picks of a cycle.
+        consensus (str): `median`, or the name of the book to take the fair line from.
+
+    Returns:
+        tuple: For every pick with a side, its index in the snapshot, the fair probability of its
+            side (NaN without a consensus) and the number of books the consensus was taken from.
+    '''
+    group_ids, _, side, valid = market_groups(snapshot)
+    book = snapshot.book[valid]
+    implied = snapshot.implied[valid]
+    n_groups = group_ids.max() + 1 if len(group_ids) else 0
+
+    # (group, side) and (group, book) IDs of every pick
+    side_ids, side_keys = snapshot.group(group_ids, side)
+    book_ids, _ = snapshot.group(group_ids, book)
+    sides = np.bincount(side_keys[:, 0].astype(np.int64), minlength=n_groups)
+
+    # A book's prices only sum to 1 plus its vig if it prices every side
+    book_sides = np.bincount(book_ids)
+    book_total = np.bincount(book_ids, weights=implied)
+    # Only groups with a side for every outcome of their market can be normalized
+    outcomes = group_outcomes(snapshot, group_ids, valid)
+    complete = (book_sides[book_ids] == sides[group_ids]) & (sides[group_ids] == outcomes[group_ids]) & (outcomes[group_ids] >= 2)
+    fair = implied / book_total[book_ids]
+
+    if consensus == 'median':
+        contributing = complete
+    else:
+        contributing = complete & (book == snapshot.code('book', consensus))
+    side_fair, side_books = _group_median(side_ids[contributing], fair[contributing], len(side_keys))
+
+    # Every side of the group needs a consensus for the probabilities to be normalized
+    side_groups = side_keys[:, 0].astype(np.int64)
+    missing = np.bincount(side_groups, weights=np.isnan(side_fair), minlength=n_groups) > 0
+    group_total = np.bincount(side_groups, weights=np.nan_to_num(side_fair), minlength=n_groups)
+    side_fair = np.where(missing[side_groups], np.nan, side_fair / group_total[side_groups])
+    return valid, side_fair[side_ids], side_books[side_ids]
+
+def find_positive_ev(snapshot: OddsSnapshot, threshold: float = 2, consensus: str = 'median',
+                     min_books: int = 3) -> list[PositiveEV]:
+    '''
+    Finds every pick whose price beats the no-vig consensus by more than `threshold` percent.
+
+    Args:
+        snapshot (OddsSnapshot): The picks of a cycle.
+        threshold (float): The smallest edge to report, in percent of the stake.
+        consensus (str): `median`, or the name of the book to take the fair line from.
+        min_books (int): The fewest books a median consensus is taken from.
+
+    Returns:
+        list[PositiveEV]: The positive EV picks, largest edge first.
+    '''
+    if len(snapshot) == 0:
+        return []
+
+    valid, fair, books = fair_probabilities(snapshot, consensus)
+    if consensus == 'median':
+        fair = np.where(books >= min_books, fair, np.nan)
+    edge = (fair * snapshot.decimal[valid] - 1) * 100
+    flagged = np.flatnonzero(np.nan_to_num(edge, nan=-np.inf) > threshold)
+    flagged = flagged[np.argsort(-edge[flagged])]
+
+    picks = valid[flagged]
+    fair_odds = np.round(decimal_to_american_batch(1 / fair[flagged])).astype(np.int64).tolist()
+    event_picks = zip(
+        snapshot.event[picks].tolist(),
+        snapshot.decode('market', snapshot.market[picks]),
+        snapshot.decode('player', snapshot.player[picks]),
+        snapshot.decode('book', snapshot.book[picks]),
+        snapshot.decode('team', snapshot.team[picks]),
+        snapshot.decode('outcome', snapshot.outcome[picks]),
+        snapshot.line[picks].tolist(),
+        snapshot.american[picks].tolist(),
+    )
+    return [
+        PositiveEV(
+            snapshot.events[event], market, player,
+            {
+                'book': book,
+                'team': team,
+                'outcome': outcome,
+                'line': None if np.isnan(line) else line,
+                'odds': odds,
+            },
+            p, american, e, n,
+        )
+        for (event, market, player, book, team, outcome, line, odds), p, american, e, n in zip(
+            event_picks, fair[flagged].tolist(), fair_odds, edge[flagged].tolist(), books[flagged].tolist()
+        )
+    ]
@@ -0,0 +1,117 @@
+import heapq
+import itertools
+
+from utils import logger
+from .incremental import ArbitrageChange
+from .scanner import Arbitrage
+from .stakes import max_profit
+
+class OpportunityFeed:
+    '''
+    The best `size` open arbitrage opportunities, kept up to date from a stream of `ArbitrageChange`s.
+
+    Opportunities are ranked by ROI, by the profit they guarantee when staked on their own
+    within the bankroll, book balances and max bets, or by a custom score function.
+    The top opportunities are kept in a min-heap bounded to `size`, so a new opportunity only
+    has to beat the worst of them. The heap is rebuilt from the other open opportunities only
+    when one of the top ones closes or scores lower. Every opportunity that enters the top is
+    passed to the `on_enter` callbacks, so alerts go out while the slate is still being scraped.
+    '''
+
+    def __init__(self, size: int = 10, rank: str = 'roi', bankroll: float = 100,
+                 balances: dict[str, float] = None, max_bets: dict[str, float] = None, score=None):
+        self.size = size
+        self.bankroll = bankroll
+        self.balances = balances or {}
+        self.max_bets = max_bets or {}
+        if score is not None:
+            self.score = score
+        elif rank == 'roi':
+            self.score = lambda arbitrage: arbitrage.roi
+        elif rank == 'profit':
+            # Limits cap some opportunities before the bankroll does, so this differs from ROI
+            self.score = lambda arbitrage: max_profit(arbitrage, self.bankroll, self.balances, self.max_bets)
+        else:
+            raise ValueError(f'Ranking {rank} is not supported.')
+
+        self.on_enter = []
+        # Key -> (score, arbitrage) of every open opportunity
+        self._open = {}
+        # (score, sequence, key) of the top opportunities, the worst first
+        self._top = []
+        self._top_keys = set()
+        self._sequence = itertools.count()
+
+    @classmethod
+    def from_config(cls):
+        from config import Config
+        return cls(
+            Config.FEED_SIZE, Config.FEED_RANK, Config.ARBITRAGE_BANKROLL, Config.BOOK_BALANCES, Config.BOOK_MAX_BETS,
+        )
+
+    def update(self, changes: list[ArbitrageChange]):
+        for change in changes:
+            if change.kind == ArbitrageChange.CLOSED:
+                self.remove(change.arbitrage)
+            else:
+                self.push(change.arbitrage)
+
+    def push(self, arbitrage: Arbitrage):
+        '''
+        Adds an opportunity or rescores it if it is already open.
+        '''
+        key = arbitrage.key
+        score = self.score(arbitrage)
+        previous = self._open.get(key)
+        self._open[key] = (score, arbitrage)
+
+        if key in self._top_keys:
+            if score < previous[0]:
+                # It may have dropped below an opportunity outside the top
+                self._rebuild()
+            else:
+                self._rebuild_heap()
+            return
+
+        if len(self._top) < self.size:
+            heapq.heappush(self._top, (score, next(self._sequence), key))
+        elif self._top and score > self._top[0][0]:
+            _, _, dropped = heapq.heapreplace(self._top, (score, next(self._sequence), key))
+            self._top_keys.discard(dropped)
+        else:
+            return
+        self._top_keys.add(key)
+        self._entered(arbitrage)
+
+    def remove(self, arbitrage: Arbitrage):
+        key = arbitrage.key
+        if self._open.pop(key, None) is not None and key in self._top_keys:
+            self._rebuild()
+
+    def top(self) -> list[Arbitrage]:
+        '''
+        Returns the top opportunities, the best first.
+        '''
+        return [self._open[key][1] for _, _, key in sorted(self._top, reverse=True)]
+
+    def _rebuild_heap(self):
+        self._top = [(self._open[key][0], next(self._sequence), key) for key in self._top_keys]
+        heapq.heapify(self._top)
+
+    def _rebuild(self):
+        best = heapq.nlargest(self.size, self._open.items(), key=lambda item: item[1][0])
+        entered = [arbitrage for key, (_, arbitrage) in best if key not in self._top_keys]
+        self._top_keys = {key for key, _ in best}
+        self._rebuild_heap()
+        for arbitrage in entered:
+            self._entered(arbitrage)
+
+    def _entered(self, arbitrage):
+        for callback in self.on_enter:
+            try:
+                callback(arbitrage)
+            except Exception as e:
+                logger.error(f'{type(e).__name__} encountered while sending `{arbitrage}`: {e}')
+
+    def __len__(self):
+        return len(self._top)
@@ -0,0 +1,202 @@
+from scraper.models import ScrapedEvent, ScrapedBook, ScrapedPick
+from .arbitrage import american_to_decimal
+from .complements import group_key
+from .scanner import Arbitrage, is_priced_side, market_outcomes
+
+def _is_priced(pick: ScrapedPick) -> bool:
+    return is_priced_side(pick.team is not None, pick.outcome is not None, pick.odds)
+
+class ArbitrageChange:
+    '''
+    An arbitrage opportunity that opened, changed its legs or closed.
+    '''
+    OPENED = 'opened'
+    UPDATED = 'updated'
+    CLOSED = 'closed'
+
+    def __init__(self, kind: str, arbitrage: Arbitrage):
+        self.kind = kind
+        self.arbitrage = arbitrage
+
+    def __str__(self):
+        return f'{self.kind}: {self.arbitrage}'
+
+class MarketGroup:
+    '''
+    Every book's price for every side of one market group.
+    '''
+
+    def __init__(self, event: ScrapedEvent, key: tuple):
+        self.event = event
+        self.key = key
+        # Side -> book name -> pick
+        self.sides = {}
+
+    def set(self, side, book_name, pick):
+        self.sides.setdefault(side, {})[book_name] = pick
+
+    def discard(self, side, book_name):
+        books = self.sides.get(side)
+        if books is not None:
+            books.pop(book_name, None)
+            if not books:
+                del self.sides[side]
+
+    def evaluate(self, investment) -> Arbitrage | None:
+        '''
+        Returns the arbitrage of the best price of every side, or None if there is none.
+        '''
+        # Every outcome of the market needs a side, as in `scan_arbitrage`
+        outcomes = {market_outcomes(pick.market, pick.outcome) for books in self.sides.values() for pick in books.values()}
+        if len(outcomes) != 1 or len(self.sides) < 2 or len(self.sides) != outcomes.pop():
+            return None
+
+        best = []
+        for books in self.sides.values():
+            book_name, pick = max(books.items(), key=lambda item: american_to_decimal(item[1].odds))
+            best.append((book_name, pick, 1 / american_to_decimal(pick.odds)))
+        implied_total = sum(implied for _, _, implied in best)
+        if implied_total >= 1:
+            return None
+
+        legs = [{
+            'book': book_name,
+            'team': pick.team,
+            'outcome': pick.outcome,
+            'line': pick.line,
+            'odds': pick.odds,
+            'stake': investment * implied / implied_total,
+        } for book_name, pick, implied in best]
+        _, market, player, team, line = self.key
+        return Arbitrage(self.event, market, player, team, line, legs, implied_total, investment)
+
+class ArbitrageTracker:
+    '''
+    Keeps the open arbitrage opportunities up to date as individual prices change.
+
+    Prices are kept per market group, so inserting, updating or removing a pick only
+    re-evaluates the group of that pick, and the cost of a change does not depend on the
+    size of the slate. Every change that opens, alters or closes an opportunity is returned
+    as an `ArbitrageChange`. Picks are filtered and grouped as in `scan_arbitrage`, so both
+    find the same opportunities.
+    '''
+
+    def __init__(self, investment: float = 100):
+        self.investment = investment
+        self._groups = {}
+        # Group key -> open arbitrage
+        self.opportunities = {}
+        # (event ID, book name) -> (group key, side) -> pick, to diff a book against its last scrape
+        self._book_picks = {}
+
+    def insert(self, event: ScrapedEvent, book_name: str, pick: ScrapedPick) -> list[ArbitrageChange]:
+        '''
+        Sets a book's price for the side of a pick, replacing its previous price for that side.
+        '''
+        if not _is_priced(pick):
+            # The previous price is gone, the new one cannot be used
+            return self.remove(event, book_name, pick)
+        key, side = group_key(event, pick)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = MarketGroup(event, key)
+        group.set(side, book_name, pick)
+        self._book_picks.setdefault((event.id, book_name), {})[(key, side)] = pick
+        return self._evaluate(group)
+
+    update = insert
+
+    def remove(self, event: ScrapedEvent, book_name: str, pick: ScrapedPick) -> list[ArbitrageChange]:
+        '''
+        Removes a book's price for the side of a pick.
+        '''
+        key, side = group_key(event, pick)
+        group = self._groups.get(key)
+        if group is None:
+            return []
+        group.discard(side, book_name)
+        book_picks = self._book_picks.get((event.id, book_name))
+        if book_picks is not None:
+            book_picks.pop((key, side), None)
+
+        changes = self._evaluate(group)
+        if not group.sides:
+            del self._groups[key]
+        return changes
+
+    def apply_book(self, event: ScrapedEvent, book: ScrapedBook) -> list[ArbitrageChange]:
+        '''
+        Applies a fresh scrape of an event's book as the deltas against its previous scrape.
+        '''
+        previous = self._book_picks.get((event.id, book.book_name), {})
+        current = {}
+        for pick in book.picks:
+            if _is_priced(pick):
+                current[group_key(event, pick)] = pick
+
+        changes = []
+        for side_key, pick in list(previous.items()):
+            if side_key not in current:
+                changes.extend(self.remove(event, book.book_name, pick))
+        for side_key, pick in current.items():
+            old = previous.get(side_key)
+            if old is None or old.odds != pick.odds:
+                changes.extend(self.insert(event, book.book_name, pick))
+        return changes
+
+    def remove_book(self, event: ScrapedEvent, book_name: str) -> list[ArbitrageChange]:
+        '''
+        Removes every price of one book of an event, e.g. when the book stopped offering it.
+        '''
+        changes = []
+        for pick in list(self._book_picks.pop((event.id, book_name), {}).values()):
+            changes.extend(self.remove(event, book_name, pick))
+        return changes
+
+    def remove_event(self, event_id: str) -> list[ArbitrageChange]:
+        '''
+        Removes every price of an event, closing its opportunities.
+        '''
+        changes = []
+        for event_book in [eb for eb in self._book_picks if eb[0] == event_id]:
+            for key, _ in self._book_picks.pop(event_book):
+                group = self._groups.pop(key, None)
+                if group is not None:
+                    group.sides.clear()
+                    changes.extend(self._evaluate(group))
+        return changes
+
+    def sync(self, events: list[ScrapedEvent]) -> list[ArbitrageChange]:
+        '''
+        Applies the books of a whole cycle, drops the books an event is no longer offered at
+        and the events that are no longer scheduled.
+        '''
+        changes = []
+        scheduled = {event.id: event for event in events}
+        offered = set()
+        for event in events:
+            for book in event.books:
+                offered.add((event.id, book.book_name))
+                changes.extend(self.apply_book(event, book))
+        for event_id, book_name in [eb for eb in self._book_picks if eb not in offered]:
+            if event_id in scheduled:
+                changes.extend(self.remove_book(scheduled[event_id], book_name))
+        for event_id in {event_id for event_id, _ in self._book_picks} - scheduled.keys():
+            changes.extend(self.remove_event(event_id))
+        return changes
+
+    def _evaluate(self, group: MarketGroup) -> list[ArbitrageChange]:
+        arbitrage = group.evaluate(self.investment)
+        previous = self.opportunities.get(group.key)
+        if arbitrage is None:
+            if previous is None:
+                return []
+            del self.opportunities[group.key]
+            return [ArbitrageChange(ArbitrageChange.CLOSED, previous)]
+
+        self.opportunities[group.key] = arbitrage
+        if previous is None:
+            return [ArbitrageChange(ArbitrageChange.OPENED, arbitrage)]
+        if previous.legs != arbitrage.legs:
+            return [ArbitrageChange(ArbitrageChange.UPDATED, arbitrage)]
+        return []
@@ -0,0 +1,160 @@
+from bisect import bisect_left
+import math
+
+from scraper.models import ScrapedEvent, ScrapedPick
+from .arbitrage import american_to_decimal
+from .scanner import is_team_market
+
+class Middle:
+    '''
+    Two picks on opposite sides of a market at different lines, where a result inside
+    the window between the lines wins both.
+
+    For totals the window is on the total, for spreads on the home team's margin of victory.
+    Results exactly on a whole-number line push that leg instead.
+    '''
+
+    def __init__(self, event: ScrapedEvent, market: str, player: str, team: str,
+                 window: tuple[float, float], legs: list[dict], investment: float):
+        self.event = event
+        self.market = market
+        self.player = player
+        self.team = team
+        self.window = window
+        self.legs = legs
+        self.investment = investment
+        # Stakes pay out the same whichever side wins, so only one payout is lost outside the window
+        payout = legs[0]['stake'] * american_to_decimal(legs[0]['odds'])
+        self.worst_case = payout - investment
+        self.middle_profit = 2 * payout - investment
+
+    def __str__(self):
+        books = ', '.join(f'{leg["book"]} {leg["line"]} {leg["odds"]}' for leg in self.legs)
+        return (
+            f'{self.event} {self.player or self.team or ""} {self.market} {self.window}: '
+            f'{self.worst_case:.2f} / {self.middle_profit:.2f} ({books})'
+        )
+
+    def to_dict(self):
+        return {
+            'event_id': self.event.id,
+            'event': str(self.event),
+            'market': self.market,
+            'player': self.player,
+            'team': self.team,
+            'window': list(self.window),
+            'legs': self.legs,
+            'investment': self.investment,
+            'worst_case': self.worst_case,
+            'middle_profit': self.middle_profit,
+        }
+
+def pick_threshold(event: ScrapedEvent, pick: ScrapedPick) -> tuple[str, float] | None:
+    '''
+    Returns which way a pick wins and the value it has to beat, or None if it has no line.
+
+    An over or a home spread wins `above` its threshold, an under or an away spread `below` it.
+    Spread thresholds are on the home team's margin: home -2.5 wins above 2.5, away +3.5 below 3.5.
+    '''
+    if pick.line is None:
+        return None
+    if pick.outcome == 'over':
+        return 'above', pick.line
+    if pick.outcome == 'under':
+        return 'below', pick.line
+    if pick.outcome is None and pick.team == event.home_team:
+        return 'above', -pick.line
+    if pick.outcome is None and pick.team == event.away_team:
+        return 'below', pick.line
+    return None
+
+class LineIndex:
+    '''
+    The best price at every line of both sides of one market, sorted by threshold so the
+    lines that form a middle with a pick are found with a binary search.
+    '''
+
+    def __init__(self):
+        # Side -> threshold -> (book name, pick)
+        self._best = {'above': {}, 'below': {}}
+        self._thresholds = None
+
+    def add(self, side: str, threshold: float, book_name: str, pick: ScrapedPick):
+        best = self._best[side]
+        current = best.get(threshold)
+        if current is None or american_to_decimal(pick.odds) > american_to_decimal(current[1].odds):
+            best[threshold] = (book_name, pick)
+            self._thresholds = None
+
+    def candidates(self, threshold: float, max_width: float = None):
+        '''
+        Yields the best `above` pick of every threshold below a `below` threshold, within `max_width`.
+        '''
+        if self._thresholds is None:
+            self._thresholds = sorted(self._best['above'])
+        thresholds = self._thresholds
+        low = 0 if max_width is None else bisect_left(thresholds, threshold - max_width)
+        high = bisect_left(thresholds, threshold)
+        for t in thresholds[low:high]:
+            yield t, self._best['above'][t]
+
+    def below(self):
+        return self._best['below'].items()
+
+def find_middles(events: list[ScrapedEvent], investment: float = 100, max_loss: float = None,
+                 max_width: float = None) -> list[Middle]:
+    '''
+    Finds every middle across the books of a cycle.
+
+    Args:
+        events (list[ScrapedEvent]): The events of the cycle with their books attached.
+        investment (float): The total amount staked on each middle.
+        max_loss (float): The largest worst-case loss to report, in percent of the investment.
+        max_width (float): The widest window to report.
+
+    Returns:
+        list[Middle]: The middles, smallest worst-case loss first.
+    '''
+    middles = []
+    for event in events:
+        # (market, player, team) -> line index, team only kept for `team_*` markets as in the scanner
+        indexes = {}
+        for book in event.books:
+            for pick in book.picks:
+                threshold = pick_threshold(event, pick)
+                if threshold is None:
+                    continue
+                team = pick.team if pick.outcome is not None and is_team_market(pick.market) else None
+                index = indexes.get((pick.market, pick.player, team))
+                if index is None:
+                    index = indexes[(pick.market, pick.player, team)] = LineIndex()
+                index.add(*threshold, book.book_name, pick)
+
+        for (market, player, team), index in indexes.items():
+            for high, (below_book, below_pick) in index.below():
+                for low, (above_book, above_pick) in index.candidates(high, max_width):
+                    # Results are whole numbers, a window without one inside, e.g. over 7 and
+                    # under 8, can only push a leg and never win both
+                    if math.floor(low) + 1 >= high:
+                        continue
+                    middle = _middle(
+                        event, market, player, team, (low, high),
+                        [(above_book, above_pick), (below_book, below_pick)], investment
+                    )
+                    if max_loss is None or -middle.worst_case <= investment * max_loss / 100:
+                        middles.append(middle)
+
+    middles.sort(key=lambda m: m.worst_case, reverse=True)
+    return middles
+
+def _middle(event, market, player, team, window, picks, investment):
+    implied = [1 / american_to_decimal(pick.odds) for _, pick in picks]
+    legs = [{
+        'book': book_name,
+        'team': pick.team,
+        'outcome': pick.outcome,
+        'line': pick.line,
+        'odds': pick.odds,
+        'stake': investment * ip / sum(implied),
+    } for (book_name, pick), ip in zip(picks, implied)]
+    return Middle(event, market, player, team, window, legs, investment)
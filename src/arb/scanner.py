@@ -0,0 +1,232 @@
+import numpy as np
+
+from scraper.models import ScrapedEvent
+from utils import OPPOSITE_OUTCOMES
+from .snapshot import OddsSnapshot
+
+# Markets named like this have a tie as their third outcome beside both teams
+THREE_WAY_SUFFIX = '3way'
+# American odds between -100 and +100 do not exist, they come from a misparsed price
+MIN_AMERICAN_ODDS = 100
+# Markets named like this are on one team, the only markets whose team is not a side
+TEAM_MARKET_PREFIX = 'team_'
+
+class Arbitrage:
+    '''
+    A set of picks from different books covering every outcome of a market for a guaranteed profit.
+
+    Every leg pays out the same amount, `investment / implied_total`, whichever outcome wins.
+    '''
+
+    def __init__(self, event: ScrapedEvent, market: str, player: str, team: str, line: float,
+                 legs: list[dict], implied_total: float, investment: float):
+        self.event = event
+        self.market = market
+        self.player = player
+        # Only set for `team_*` markets, the team of every other market is a side
+        self.team = team
+        # For spreads, the line of the home team
+        self.line = line
+        self.legs = legs
+        self.implied_total = implied_total
+        self.investment = investment
+        self.profit = investment / implied_total - investment
+        self.roi = self.profit / investment * 100
+
+    def __str__(self):
+        books = ', '.join(f'{leg["book"]} {leg["odds"]}' for leg in self.legs)
+        return f'{self.event} {self.player or self.team or ""} {self.market} {self.line}: {self.roi:.2f}% ({books})'
+
+    @property
+    def key(self):
+        return self.event.id, self.market, self.player, self.team, self.line
+
+    def to_dict(self):
+        return {
+            'event_id': self.event.id,
+            'event': str(self.event),
+            'market': self.market,
+            'player': self.player,
+            'team': self.team,
+            'line': self.line,
+            'legs': self.legs,
+            'implied_total': self.implied_total,
+            'investment': self.investment,
+            'profit': self.profit,
+            'roi': self.roi,
+        }
+
+def is_priced_side(has_team, has_outcome, american):
+    '''
+    Returns whether a pick backs a side, a team or an outcome, at a price that can exist.
+
+    Works on single picks as well as on whole snapshot columns, so the scanner and the
+    tracker skip the same picks.
+    '''
+    return (has_team | has_outcome) & (abs(american) >= MIN_AMERICAN_ODDS)
+
+def is_team_market(market: str) -> bool:
+    '''
+    Returns whether a market is on one team, so that its picks with an outcome are grouped by
+    their team. Picks of any other market with an outcome may still carry a team, such as the
+    game totals of BetMGM's six-pack, which get the team of their row.
+    '''
+    return market.startswith(TEAM_MARKET_PREFIX)
+
+def market_outcomes(market: str, outcome: str | None) -> int:
+    '''
+    Returns how many outcomes the market of a pick has, or 0 if that is not known.
+
+    A group only covers every result once it has a side for each outcome. Picks on a team
+    without an outcome (moneylines, spreads) and two-way outcomes (over/under, yes/no,
+    odd/even) have 2, `*3way` markets have 3. Any other outcome may be one of many, e.g. a
+    first scorer, so a group of them is never known to be complete.
+    '''
+    if market.endswith(THREE_WAY_SUFFIX):
+        return 3
+    if outcome is None or outcome in OPPOSITE_OUTCOMES:
+        return 2
+    return 0
+
+def market_groups(snapshot: OddsSnapshot) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Groups the picks of a snapshot into markets whose sides are mutually exclusive outcomes.
+
+    A group is (event, market, player, team, line), as in `group_key`. Moneyline and spread
+    picks carry the team and no outcome, so their team is the side and their line is flipped
+    to the home team's point of view, putting home -1.5 and away +1.5 in the same group.
+    Picks with an outcome (over/under, yes/no) only keep their team in the group for `team_*`
+    markets, which separates those by team.
+
+    Returns:
+        tuple: The group ID and side of every pick that has a side, the key of every group,
+            and the indexes of those picks in the snapshot.
+    '''
+    team = snapshot.team.astype(np.int32)
+    outcome = snapshot.outcome.astype(np.int32)
+    has_outcome = outcome >= 0
+    valid = np.flatnonzero(is_priced_side(team >= 0, has_outcome, snapshot.american))
+
+    market = snapshot.market
+    away = ~has_outcome & (team >= 0) & (team != snapshot.event_home[snapshot.event])
+    line = np.where(away, -snapshot.line, snapshot.line)
+
+    # Codes of both kinds of side share a column, so keep them apart with negative team codes
+    side = np.where(has_outcome, outcome, -2 - team)
+    team_market = np.array([is_team_market(m) for m in snapshot.tables['market'].values], dtype=bool)
+    group_team = np.where(has_outcome & team_market[market], team, -1)
+
+    columns = [snapshot.event, market, snapshot.player, group_team, line]
+    group_ids, keys = snapshot.group(*[c[valid] for c in columns])
+    return group_ids, keys, side[valid], valid
+
+def group_outcomes(snapshot: OddsSnapshot, group_ids: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    '''
+    Returns the number of sides every group of `market_groups` needs to be complete, as given
+    by `market_outcomes`, or 0 if it is not known or its picks disagree on it.
+    '''
+    n_groups = group_ids.max() + 1 if len(group_ids) else 0
+    market = snapshot.market[valid].astype(np.int64)
+    outcome = snapshot.outcome[valid].astype(np.int64)
+    # Every distinct (market, outcome) is looked up once, outcomes are shifted past the -1 of None
+    width = len(snapshot.tables['outcome']) + 1
+    pairs, inverse = np.unique(market * width + outcome + 1, return_inverse=True)
+    per_pair = np.array([
+        market_outcomes(snapshot.tables['market'].decode(pair // width), snapshot.tables['outcome'].decode(pair % width - 1))
+        for pair in pairs.tolist()
+    ], dtype=np.int64)
+    required = per_pair[inverse.reshape(-1)]
+
+    lowest = np.full(n_groups, np.iinfo(np.int64).max)
+    highest = np.zeros(n_groups, dtype=np.int64)
+    np.minimum.at(lowest, group_ids, required)
+    np.maximum.at(highest, group_ids, required)
+    return np.where(lowest == highest, highest, 0)
+
+def best_prices(group_ids: np.ndarray, side: np.ndarray, decimal: np.ndarray) -> np.ndarray:
+    '''
+    Returns the index of the pick with the best decimal odds for every side of every group,
+    ordered by group.
+    '''
+    order = np.lexsort((-decimal, side, group_ids))
+    sorted_groups = group_ids[order]
+    sorted_sides = side[order]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = (sorted_groups[1:] != sorted_groups[:-1]) | (sorted_sides[1:] != sorted_sides[:-1])
+    return order[first]
+
+def scan_arbitrage(snapshot: OddsSnapshot, investment: float = 100) -> list[Arbitrage]:
+    '''
+    Finds every arbitrage opportunity across the books and markets of a snapshot.
+
+    The best price of every side of every market group is taken across all books, and a group
+    whose best prices have a summed implied probability below 1 is an opportunity. Only groups
+    with a side for every outcome of their market, see `market_outcomes`, are considered.
+
+    Args:
+        snapshot (OddsSnapshot): The picks of a cycle.
+        investment (float): The total amount staked on each opportunity.
+
+    Returns:
+        list[Arbitrage]: The opportunities, most profitable first.
+    '''
+    if len(snapshot) == 0:
+        return []
+
+    group_ids, keys, side, valid = market_groups(snapshot)
+    if len(valid) == 0:
+        return []
+    decimal = snapshot.decimal[valid]
+    best = best_prices(group_ids, side, decimal)
+
+    best_groups = group_ids[best]
+    best_implied = 1 / decimal[best]
+    sides = np.bincount(best_groups)
+    implied_total = np.bincount(best_groups, weights=best_implied)
+    outcomes = group_outcomes(snapshot, group_ids, valid)
+    candidates = np.flatnonzero((sides == outcomes) & (outcomes >= 2) & (implied_total < 1))
+    if len(candidates) == 0:
+        return []
+
+    # Stakes are proportional to the implied probabilities so every leg pays the same
+    stakes = investment * best_implied / implied_total[best_groups]
+
+    # Decode the few legs of the opportunities in bulk instead of pick by pick
+    leg_positions = np.flatnonzero(np.isin(best_groups, candidates))
+    leg_picks = valid[best[leg_positions]]
+    leg_books = snapshot.decode('book', snapshot.book[leg_picks])
+    leg_teams = snapshot.decode('team', snapshot.team[leg_picks])
+    leg_outcomes = snapshot.decode('outcome', snapshot.outcome[leg_picks])
+    leg_lines = [None if np.isnan(line) else line for line in snapshot.line[leg_picks].tolist()]
+    leg_odds = snapshot.american[leg_picks].tolist()
+    leg_stakes = stakes[leg_positions].tolist()
+
+    arbitrages = []
+    k = 0
+    for g in candidates.tolist():
+        legs = []
+        for _ in range(sides[g]):
+            legs.append({
+                'book': leg_books[k],
+                'team': leg_teams[k],
+                'outcome': leg_outcomes[k],
+                'line': leg_lines[k],
+                'odds': leg_odds[k],
+                'stake': leg_stakes[k],
+            })
+            k += 1
+
+        event, market, player, team, line = keys[g].tolist()
+        arbitrages.append(Arbitrage(
+            snapshot.events[int(event)],
+            snapshot.decode('market', market)[0],
+            snapshot.decode('player', player)[0],
+            snapshot.decode('team', team)[0],
+            None if np.isinf(line) else line,
+            legs,
+            float(implied_total[g]),
+            investment,
+        ))
+
+    arbitrages.sort(key=lambda a: a.roi, reverse=True)
+    return arbitrages
@@ -0,0 +1,191 @@
+import numpy as np
+
+from scraper.models import ScrapedEvent
+from .arbitrage import american_to_decimal_batch
+
+class CodeTable:
+    '''
+    Maps the distinct values of a categorical column to small integer codes.
+
+    `None` is always encoded as -1.
+    '''
+
+    def __init__(self):
+        self.values = []
+        self._codes = {}
+
+    def encode(self, value):
+        if value is None:
+            return -1
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def code(self, value):
+        '''
+        Returns the code of a value without adding it, or -2 if it is not in the table.
+        '''
+        if value is None:
+            return -1
+        return self._codes.get(value, -2)
+
+    def decode(self, code):
+        return None if code < 0 else self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+class OddsSnapshot:
+    '''
+    A cycle's picks stored as parallel NumPy arrays, with one element per pick.
+
+    The nested `ScrapedEvent` -> `ScrapedBook` -> `ScrapedPick` tree is flattened once, with
+    categorical fields encoded against `CodeTable`s, so filtering and grouping over hundreds
+    of thousands of picks is vectorized instead of walking Python lists.
+
+    Columns:
+        event: Index into `events`.
+        book, market, team, player, outcome: Codes into the matching code table, -1 for None.
+        line: The line of the pick, NaN for None.
+        american, decimal, implied: The odds in American and decimal format and the implied probability.
+    '''
+
+    CATEGORICAL = ('book', 'market', 'team', 'player', 'outcome')
+
+    def __init__(self, events: list[ScrapedEvent], tables: dict[str, CodeTable], columns: dict[str, np.ndarray]):
+        self.events = events
+        self.tables = tables
+        self.columns = columns
+        # The home and away team code of every event, for columns derived per pick
+        self.event_away = np.array([tables['team'].code(e.away_team) for e in events], dtype=np.int32)
+        self.event_home = np.array([tables['team'].code(e.home_team) for e in events], dtype=np.int32)
+
+    @classmethod
+    def from_events(cls, events: list[ScrapedEvent]) -> 'OddsSnapshot':
+        '''
+        Flattens the scraped events of a cycle into a snapshot.
+
+        Args:
+            events (list[ScrapedEvent]): The events of the cycle with their books attached.
+
+        Returns:
+            OddsSnapshot: The snapshot of every pick of every book.
+        '''
+        events = list(events)
+        tables = {name: CodeTable() for name in cls.CATEGORICAL}
+        for event in events:
+            tables['team'].encode(event.away_team)
+            tables['team'].encode(event.home_team)
+
+        book_table, market_table, team_table = tables['book'], tables['market'], tables['team']
+        player_table, outcome_table = tables['player'], tables['outcome']
+        event_col, book_col, market_col, team_col, player_col, outcome_col = [], [], [], [], [], []
+        line_col, american_col = [], []
+        for i, event in enumerate(events):
+            for book in event.books:
+                book_code = book_table.encode(book.book_name)
+                for pick in book.picks:
+                    event_col.append(i)
+                    book_col.append(book_code)
+                    market_col.append(market_table.encode(pick.market))
+                    team_col.append(team_table.encode(pick.team))
+                    player_col.append(player_table.encode(pick.player))
+                    outcome_col.append(outcome_table.encode(pick.outcome))
+                    line_col.append(np.nan if pick.line is None else pick.line)
+                    american_col.append(pick.odds)
+
+        american = np.array(american_col, dtype=np.int32)
+        decimal = american_to_decimal_batch(american)
+        columns = {
+            'event': np.array(event_col, dtype=np.int32),
+            'book': np.array(book_col, dtype=np.int16),
+            'market': np.array(market_col, dtype=np.int16),
+            'team': np.array(team_col, dtype=np.int16),
+            'player': np.array(player_col, dtype=np.int32),
+            'outcome': np.array(outcome_col, dtype=np.int16),
+            'line': np.array(line_col, dtype=np.float64),
+            'american': american,
+            'decimal': decimal,
+            'implied': 1 / decimal,
+        }
+        return cls(events, tables, columns)
+
+    def __len__(self):
+        return len(self.columns['american'])
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['columns'][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def code(self, column, value):
+        '''
+        Returns the code of a value in a categorical column, or -2 if the value never occurs.
+        '''
+        return self.tables[column].code(value)
+
+    def decode(self, column, codes):
+        '''
+        Converts codes of a categorical column back to their values.
+        '''
+        values = self.tables[column].values
+        return [None if code < 0 else values[code] for code in np.atleast_1d(codes).astype(np.int64).tolist()]
+
+    def mask(self, **conditions) -> np.ndarray:
+        '''
+        Builds a boolean mask from equality conditions, e.g. `mask(market='total', book='betmgm')`.
+
+        Categorical columns are compared by value, every other column directly.
+        '''
+        mask = np.ones(len(self), dtype=bool)
+        for column, value in conditions.items():
+            if column in self.tables:
+                value = self.code(column, value)
+            mask &= self.columns[column] == value
+        return mask
+
+    def filter(self, mask) -> 'OddsSnapshot':
+        '''
+        Returns a snapshot with only the picks selected by a boolean mask or index array.
+        '''
+        snapshot = OddsSnapshot.__new__(OddsSnapshot)
+        snapshot.events = self.events
+        snapshot.tables = self.tables
+        snapshot.columns = {name: column[mask] for name, column in self.columns.items()}
+        snapshot.event_away = self.event_away
+        snapshot.event_home = self.event_home
+        return snapshot
+
+    def where(self, **conditions) -> 'OddsSnapshot':
+        return self.filter(self.mask(**conditions))
+
+    def group(self, *columns) -> tuple[np.ndarray, np.ndarray]:
+        '''
+        Assigns a group ID to every pick from the values of the given columns.
+
+        Args:
+            *columns (str | np.ndarray): Column names, or per-pick arrays derived from the columns.
+
+        Returns:
+            tuple: The group ID of every pick, and the distinct keys with one row per group.
+        '''
+        keys = np.column_stack([
+            self.columns[c] if isinstance(c, str) else c for c in columns
+        ]).astype(np.float64)
+        # NaN never equals itself, so missing lines would each form their own group
+        keys[np.isnan(keys)] = np.inf
+        group_ids = np.empty(len(keys), dtype=np.int64)
+        if len(keys) == 0:
+            return group_ids, keys
+
+        # Sorting the columns and splitting where a row differs from the previous one is
+        # much faster than `np.unique(axis=0)`, which sorts the rows as opaque bytes
+        order = np.lexsort(keys.T[::-1])
+        sorted_keys = keys[order]
+        starts = np.ones(len(keys), dtype=bool)
+        starts[1:] = (sorted_keys[1:] != sorted_keys[:-1]).any(axis=1)
+        group_ids[order] = np.cumsum(starts) - 1
+        return group_ids, sorted_keys[starts]
@@ -0,0 +1,141 @@
+import numpy as np
+from scipy.optimize import linprog
+
+from utils import logger
+from .arbitrage import american_to_decimal, american_to_decimal_batch
+from .scanner import Arbitrage
+
+class Allocation:
+    '''
+    The stakes placed on the legs of one arbitrage opportunity.
+    '''
+
+    def __init__(self, arbitrage: Arbitrage, stakes: list[float]):
+        self.arbitrage = arbitrage
+        self.stakes = stakes
+        self.stake = sum(stakes)
+        payouts = american_to_decimal_batch([leg['odds'] for leg in arbitrage.legs]) * stakes
+        # Rounded stakes no longer pay exactly the same, the worst outcome is guaranteed
+        self.profit = float(payouts.min()) - self.stake
+
+    def __str__(self):
+        legs = ', '.join(f'{leg["book"]} {stake:g}' for leg, stake in zip(self.arbitrage.legs, self.stakes))
+        return f'{self.arbitrage}: {self.stake:g} staked for {self.profit:.2f} ({legs})'
+
+    def to_dict(self):
+        return {
+            **self.arbitrage.to_dict(),
+            'stakes': self.stakes,
+            'stake': self.stake,
+            'guaranteed_profit': self.profit,
+        }
+
+def max_profit(arbitrage: Arbitrage, bankroll: float, balances: dict[str, float] = None,
+               max_bets: dict[str, float] = None) -> float:
+    '''
+    Returns the largest guaranteed profit of one opportunity staked on its own within the limits.
+
+    This is `optimize_stakes` for a single opportunity, where the largest payout is the tightest
+    of the bankroll, the balance of every book and the max bet of every leg.
+
+    Args:
+        arbitrage (Arbitrage): The opportunity.
+        bankroll (float): The most that can be staked in total.
+        balances (dict[str, float]): The most that can be staked at each book, unlimited if missing.
+        max_bets (dict[str, float]): The largest single stake each book accepts, unlimited if missing.
+
+    Returns:
+        float: The guaranteed profit.
+    '''
+    balances = balances or {}
+    max_bets = max_bets or {}
+    implied = [1 / american_to_decimal(leg['odds']) for leg in arbitrage.legs]
+    payout = bankroll / sum(implied)
+    book_implied = {}
+    for leg, ip in zip(arbitrage.legs, implied):
+        book_implied[leg['book']] = book_implied.get(leg['book'], 0) + ip
+        if leg['book'] in max_bets:
+            payout = min(payout, max_bets[leg['book']] / ip)
+    for book, ip in book_implied.items():
+        if book in balances:
+            payout = min(payout, balances[book] / ip)
+    return max(payout, 0) * (1 - sum(implied))
+
+def optimize_stakes(arbitrages: list[Arbitrage], bankroll: float, balances: dict[str, float] = None,
+                    max_bets: dict[str, float] = None, rounding: float = 1) -> list[Allocation]:
+    '''
+    Splits a bankroll across many simultaneous arbitrage opportunities for the largest total profit.
+
+    The allocation is solved as one linear program. The variable of every opportunity is the
+    amount all of its legs pay out, so each leg's stake is that payout times the leg's implied
+    probability and the profit is the payout times one minus the summed implied probabilities.
+    The total stake is bounded by the bankroll, the stakes placed at a book by its balance and
+    every single stake by the book's max bet. Stakes are then floored to a multiple of
+    `rounding`, which keeps every limit satisfied.
+
+    Args:
+        arbitrages (list[Arbitrage]): The open opportunities.
+        bankroll (float): The most that can be staked in total.
+        balances (dict[str, float]): The most that can be staked at each book, unlimited if missing.
+        max_bets (dict[str, float]): The largest single stake each book accepts, unlimited if missing.
+        rounding (float): The unit stakes are rounded down to, 0 keeps them fractional.
+
+    Returns:
+        list[Allocation]: The opportunities worth staking, largest profit first.
+    '''
+    balances = balances or {}
+    max_bets = max_bets or {}
+    if not arbitrages or bankroll <= 0:
+        return []
+
+    leg_opportunity, leg_books, leg_implied = [], [], []
+    for j, arbitrage in enumerate(arbitrages):
+        for leg in arbitrage.legs:
+            leg_opportunity.append(j)
+            leg_books.append(leg['book'])
+            leg_implied.append(leg['odds'])
+    leg_opportunity = np.array(leg_opportunity)
+    leg_implied = 1 / american_to_decimal_batch(leg_implied)
+    implied_total = np.bincount(leg_opportunity, weights=leg_implied, minlength=len(arbitrages))
+
+    # Each row limits a sum of stakes: the bankroll, then one row per book with a balance
+    books = sorted(set(leg_books) & set(balances))
+    a_ub = np.zeros((1 + len(books), len(arbitrages)))
+    a_ub[0] = implied_total
+    for row, book in enumerate(books, start=1):
+        at_book = np.array([b == book for b in leg_books])
+        np.add.at(a_ub[row], leg_opportunity[at_book], leg_implied[at_book])
+    b_ub = [bankroll] + [balances[book] for book in books]
+
+    # A max bet caps the payout of the opportunity through the stake of that leg
+    upper = np.full(len(arbitrages), np.inf)
+    for book, implied, j in zip(leg_books, leg_implied, leg_opportunity):
+        if book in max_bets:
+            upper[j] = min(upper[j], max_bets[book] / implied)
+
+    result = linprog(
+        -(1 - implied_total), A_ub=a_ub, b_ub=b_ub,
+        bounds=list(zip(np.zeros(len(arbitrages)), upper)), method='highs',
+    )
+    if result.status != 0:
+        logger.error(f'Unable to optimize stakes: {result.message}')
+        return []
+
+    stakes = result.x[leg_opportunity] * leg_implied
+    if rounding:
+        stakes = np.floor(stakes / rounding + 1e-9) * rounding
+
+    allocations = []
+    start = 0
+    for arbitrage in arbitrages:
+        end = start + len(arbitrage.legs)
+        leg_stakes = stakes[start:end].tolist()
+        start = end
+        if min(leg_stakes) <= 0:
+            continue
+        allocation = Allocation(arbitrage, leg_stakes)
+        if allocation.profit > 0:
+            allocations.append(allocation)
+
+    allocations.sort(key=lambda a: a.profit, reverse=True)
+    return allocations
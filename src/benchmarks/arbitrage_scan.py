@@ -0,0 +1,74 @@
+'''
+Times building an OddsSnapshot and scanning it for arbitrage on a synthetic full slate.
+
+Usage:
+    python -m benchmarks.arbitrage_scan [--events 15] [--books 4] [--markets 150]
+'''
+from datetime import datetime, timedelta
+import argparse
+import random
+import time
+
+from scraper.models import ScrapedEvent, ScrapedBook, ScrapedPick
+from arb import OddsSnapshot, scan_arbitrage
+
+def to_american(probability):
+    decimal = 1 / probability
+    return round((decimal - 1) * 100) if decimal >= 2 else round(-100 / (decimal - 1))
+
+def make_slate(events, books, markets):
+    rng = random.Random(0)
+    start = datetime(2024, 8, 1, 19, 0)
+    slate = []
+    for e in range(events):
+        event = ScrapedEvent('mlb', f'A{e}', f'H{e}', start + timedelta(minutes=5 * e))
+        # Every market has a true probability, each book prices it with vig and its own error
+        fair = [rng.uniform(0.3, 0.7) for _ in range(markets + 1)]
+        for b in range(books):
+            def price(p):
+                return to_american(min(0.95, max(0.05, p * 1.045 + rng.gauss(0, 0.015))))
+
+            picks = [
+                ScrapedPick('moneyline', event.away_team, None, price(fair[-1])),
+                ScrapedPick('moneyline', event.home_team, None, price(1 - fair[-1])),
+                ScrapedPick('spread', event.away_team, 1.5, price(0.65)),
+                ScrapedPick('spread', event.home_team, -1.5, price(0.35)),
+            ]
+            # Every other book gives game totals the team of their row, as BetMGM's six-pack does
+            over_team, under_team = (event.away_team, event.home_team) if b % 2 else (None, None)
+            picks.append(ScrapedPick('total', over_team, 8.5, price(0.5), 'over'))
+            picks.append(ScrapedPick('total', under_team, 8.5, price(0.5), 'under'))
+            for m in range(markets):
+                # Player props: an over and an under of one player and line per market
+                player, line = f'Player {m % 40}', 0.5 + m // 40
+                picks.append(ScrapedPick('player_hits', None, line, price(fair[m]), 'over', player))
+                picks.append(ScrapedPick('player_hits', None, line, price(1 - fair[m]), 'under', player))
+            event.books.append(ScrapedBook(f'book{b}', picks))
+        slate.append(event)
+    return slate
+
+def run(events, books, markets):
+    slate = make_slate(events, books, markets)
+
+    start_time = time.perf_counter()
+    snapshot = OddsSnapshot.from_events(slate)
+    build_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    arbitrages = scan_arbitrage(snapshot)
+    scan_time = time.perf_counter() - start_time
+
+    print(
+        f'{len(snapshot)} picks: snapshot {build_time:.3f}s | scan {scan_time:.3f}s | '
+        f'{len(arbitrages)} opportunities'
+    )
+    for arbitrage in arbitrages[:5]:
+        print(f'  {arbitrage}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=15)
+    parser.add_argument('--books', type=int, default=4)
+    parser.add_argument('--markets', type=int, default=150)
+    args = parser.parse_args()
+    run(args.events, args.books, args.markets)
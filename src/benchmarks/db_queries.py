@@ -0,0 +1,167 @@
+'''
+Times the database's common queries on a seeded SQLite database, with and without the composite indexes.
+
+The database is seeded once with events, books and picks and reused by later runs with the
+same number of picks. `--no-indexes` drops the composite indexes of Event and Pick to
+compare against, and a later run without it creates them again.
+
+Usage:
+    python -m benchmarks.db_queries [--picks 1000000] [--books 5] [--runs 200] [--db data/benchmark.sqlite3] [--no-indexes]
+'''
+from datetime import datetime, timedelta
+import argparse
+import os
+import random
+import time
+
+import django
+from django.conf import settings
+
+LEAGUES = ['mlb', 'nba', 'nfl', 'nhl', 'wnba', 'ncaaf']
+SPREADS = [-2.5, -1.5, 1.5, 2.5]
+TOTALS = [7.5, 8.5, 9.5, 10.5]
+# Picks of one book of one event: moneyline, spread and total of both sides, then player props
+PROPS = 47
+PICKS_PER_BOOK = 6 + 2 * PROPS
+
+def setup(db):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    settings.DATABASES['default']['NAME'] = db
+    # Keeps Django from holding on to every seeded row in its query log
+    settings.DEBUG = False
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0, interactive=False)
+
+def seed(n_events, books):
+    from django.db import connection, transaction
+    from api.models import Event, Sportsbook, Pick
+    from api.persistence import PICK_FIELDS, bulk_insert
+
+    rng = random.Random(0)
+    start = datetime(2024, 8, 1, 19, 0)
+    adapt = connection.ops.adapt_datetimefield_value
+    with transaction.atomic():
+        # Events are spread over two months, the last tenth is still active
+        bulk_insert(Event, ['league', 'away_team', 'home_team', 'start_time', 'active'], [
+            (LEAGUES[e % len(LEAGUES)], f'A{e}', f'H{e}', adapt(start + timedelta(minutes=45 * e)), e >= n_events * 0.9)
+            for e in range(n_events)
+        ], 2000)
+        events = list(Event.objects.order_by('id').values_list('id', 'away_team', 'home_team'))
+        bulk_insert(Sportsbook, ['event', 'title', 'last_updated'], [
+            (event_id, f'book{b}', adapt(start)) for event_id, _, _ in events for b in range(books)
+        ], 2000)
+        sportsbooks = dict(
+            ((event_id, title), sportsbook_id)
+            for sportsbook_id, event_id, title in Sportsbook.objects.values_list('id', 'event_id', 'title')
+        )
+
+        odds = lambda: rng.choice([-1, 1]) * rng.randint(100, 250)
+        rows = []
+        for event_id, away_team, home_team in events:
+            spread = rng.choice(SPREADS)
+            total = rng.choice(TOTALS)
+            for b in range(books):
+                sportsbook_id = sportsbooks[(event_id, f'book{b}')]
+                rows.extend([
+                    (sportsbook_id, 'moneyline', away_team, None, None, None, odds()),
+                    (sportsbook_id, 'moneyline', home_team, None, None, None, odds()),
+                    (sportsbook_id, 'spread', away_team, None, -spread, None, odds()),
+                    (sportsbook_id, 'spread', home_team, None, spread, None, odds()),
+                    (sportsbook_id, 'total', None, None, total, 'over', odds()),
+                    (sportsbook_id, 'total', None, None, total, 'under', odds()),
+                ])
+                for p in range(PROPS):
+                    market = 'player_points' if p % 2 else 'player_rebounds'
+                    player = f'P{event_id}-{p}'
+                    rows.append((sportsbook_id, market, None, player, 10.5 + p % 5, 'over', odds()))
+                    rows.append((sportsbook_id, market, None, player, 10.5 + p % 5, 'under', odds()))
+        bulk_insert(Pick, PICK_FIELDS, rows, 2000)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return Pick.objects.count()
+
+def set_indexes(enabled):
+    from django.db import connection
+    from api.models import Event, Pick
+
+    with connection.cursor() as cursor:
+        existing = set(connection.introspection.get_constraints(cursor, Event._meta.db_table))
+        existing |= set(connection.introspection.get_constraints(cursor, Pick._meta.db_table))
+    with connection.schema_editor() as editor:
+        for model in (Event, Pick):
+            for index in model._meta.indexes:
+                if enabled and index.name not in existing:
+                    editor.add_index(model, index)
+                elif not enabled and index.name in existing:
+                    editor.remove_index(model, index)
+
+def plan(queryset):
+    from django.db import connection
+
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return '; '.join(row[-1] for row in cursor.fetchall())
+
+def run(picks, books, runs, db, indexes):
+    os.makedirs(os.path.dirname(db) or '.', exist_ok=True)
+    setup(db)
+    from django.db import connection
+    from api.models import Event, Sportsbook, Pick
+
+    n_events = max(1, picks // (books * PICKS_PER_BOOK))
+    count = Pick.objects.count()
+    if count != n_events * books * PICKS_PER_BOOK:
+        connection.close()
+        os.remove(db)
+        setup(db)
+        start_time = time.perf_counter()
+        count = seed(n_events, books)
+        print(f'Seeded {count} picks in {time.perf_counter() - start_time:.1f}s')
+    set_indexes(indexes)
+
+    rng = random.Random(1)
+    events = list(Event.objects.values_list('id', 'league', 'start_time', 'home_team'))
+    sportsbook_ids = list(Sportsbook.objects.values_list('id', flat=True))
+
+    def league_window():
+        _, league, start, _ = rng.choice(events)
+        return Event.objects.filter(league=league, start_time__gte=start, start_time__lt=start + timedelta(days=1))
+
+    def book_market():
+        return Pick.objects.filter(sportsbook_id=rng.choice(sportsbook_ids), market=rng.choice(['spread', 'player_points']))
+
+    def line_shopping():
+        _, _, _, home_team = rng.choice(events)
+        return Pick.objects.filter(market='spread', team=home_team, line=rng.choice(SPREADS), outcome__isnull=True)
+
+    def event_books():
+        # The picks of a batch of books, as loaded by OddsWriter the first time it sees an event
+        return Pick.objects.filter(sportsbook_id__in=rng.sample(sportsbook_ids, 20))
+
+    queries = [
+        ('Events of a league by start time', league_window, runs),
+        ('Active events', lambda: Event.objects.filter(active=True), runs),
+        ('Picks of a book by market', book_market, runs),
+        ('Every price of a side and line', line_shopping, runs),
+        ('Picks of 20 books', event_books, runs),
+        ('Active events with picks', lambda: Event.objects.filter(active=True).prefetch_related('sportsbooks__picks'), max(1, runs // 100)),
+    ]
+    print(f'{count} picks, composite indexes {"on" if indexes else "off"}')
+    for name, make_queryset, n in queries:
+        start_time = time.perf_counter()
+        for _ in range(n):
+            list(make_queryset())
+        elapsed = (time.perf_counter() - start_time) / n
+        print(f'{name:34s} {elapsed * 1000:10.3f}ms | {plan(make_queryset())}')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--picks', type=int, default=1000000)
+    parser.add_argument('--books', type=int, default=5)
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--db', default='data/benchmark.sqlite3')
+    parser.add_argument('--no-indexes', dest='indexes', action='store_false')
+    args = parser.parse_args()
+    run(args.picks, args.books, args.runs, args.db, args.indexes)
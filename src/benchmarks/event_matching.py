@@ -0,0 +1,64 @@
+'''
+Compares matching events with a linear scan against the EventRegistry index.
+
+Usage:
+    python -m benchmarks.event_matching [--events 1000 2000 5000] [--books 4]
+'''
+from datetime import datetime, timedelta
+import argparse
+import random
+import time
+
+from scraper.models import ScrapedEvent
+from scraper.registry import EventRegistry
+
+def make_events(n):
+    start = datetime(2024, 8, 1, 12, 0)
+    events = []
+    for i in range(n):
+        # Spread events over a couple of weeks with a realistic number of repeated matchups
+        events.append(ScrapedEvent(
+            'mlb', f'A{i % 30}', f'H{(i // 30) % 30}', start + timedelta(minutes=15 * i), False
+        ))
+    return events
+
+def book_copies(events, books):
+    # Every book reports every event with its own slightly different start time
+    rng = random.Random(0)
+    return [
+        ScrapedEvent(e.league, e.away_team, e.home_team, e.start_time + timedelta(minutes=rng.randint(-5, 5)), e.active)
+        for _ in range(books) for e in events
+    ]
+
+def linear_find(event, events):
+    for e in events:
+        if e == event:
+            return e
+    return None
+
+def run(sizes, books):
+    for n in sizes:
+        events = make_events(n)
+        lookups = book_copies(events, books)
+
+        start_time = time.perf_counter()
+        linear = [linear_find(e, events) for e in lookups]
+        linear_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        registry = EventRegistry(events)
+        indexed = [registry.find(e) for e in lookups]
+        indexed_time = time.perf_counter() - start_time
+
+        assert all(a is b for a, b in zip(linear, indexed))
+        print(
+            f'{n:6d} events x {books} books: linear {linear_time:8.3f}s | '
+            f'registry {indexed_time:8.4f}s (incl. build) | {linear_time / indexed_time:7.0f}x'
+        )
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, nargs='+', default=[1000, 2000, 5000])
+    parser.add_argument('--books', type=int, default=4)
+    args = parser.parse_args()
+    run(args.events, args.books)
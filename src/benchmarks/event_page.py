@@ -0,0 +1,68 @@
+'''
+Compares per-block and batched block extraction on live BetMGM event pages.
+
+Usage:
+    python -m benchmarks.event_page <league> <event url> [<event url> ...] [--runs N]
+'''
+from selenium.webdriver.remote.webdriver import WebDriver
+from datetime import datetime
+from config import Config
+import argparse
+import statistics
+import time
+
+from scraper import BetMGMScraper
+from scraper.models import ScrapedEvent
+
+class RoundTripCounter:
+    '''
+    Counts the commands a WebDriver sends to the browser driver.
+
+    Every WebDriver and WebElement command goes through `WebDriver.execute`,
+    so wrapping it counts each HTTP round trip to chromedriver/geckodriver.
+    '''
+
+    def __init__(self, driver: WebDriver):
+        self.count = 0
+        self._execute = driver.execute
+        driver.execute = self._counted_execute
+
+    def _counted_execute(self, *args, **kwargs):
+        self.count += 1
+        return self._execute(*args, **kwargs)
+
+def run(league, urls, runs):
+    scraper = BetMGMScraper()
+    event = ScrapedEvent(league, 'AWAY', 'HOME', datetime.now())
+    driver = Config.get_driver()
+    counter = RoundTripCounter(driver)
+
+    try:
+        for batch in (False, True):
+            Config.BATCH_EXTRACTION = batch
+            round_trips, durations, blocks = [], [], []
+            for _ in range(runs):
+                for url in urls:
+                    counter.count = 0
+                    start_time = time.perf_counter()
+                    page = scraper.fetch_event_page(league, event, url, driver)
+                    durations.append(time.perf_counter() - start_time)
+                    round_trips.append(counter.count)
+                    blocks.append(len(page))
+
+            mode = 'batched' if batch else 'per-block'
+            print(
+                f'{mode:>9}: {statistics.mean(blocks):6.1f} blocks/page, '
+                f'{statistics.mean(round_trips):7.1f} round trips/page, '
+                f'{statistics.mean(durations):6.2f}s/page (median {statistics.median(durations):.2f}s)'
+            )
+    finally:
+        driver.quit()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('league')
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+    run(args.league, args.urls, args.runs)
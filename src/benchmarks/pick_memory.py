@@ -0,0 +1,62 @@
+'''
+Measures the memory used per pick for a full-slate snapshot of scraped picks.
+
+Usage:
+    python -m benchmarks.pick_memory [--events 15] [--books 4] [--picks 600]
+'''
+import argparse
+import tracemalloc
+
+from scraper.models import ScrapedPick
+
+class DictPick:
+    # The dict-backed layout ScrapedPick used before it was slotted and interned
+    def __init__(self, market, team, line, odds, outcome=None, player=None):
+        self.market = market
+        self.team = team
+        self.line = line
+        self.odds = odds
+        self.outcome = outcome
+        self.player = player
+
+MARKETS = ['Moneyline', 'Spread', 'Total', 'Player Hits', 'Player Strikeouts', 'Player Total Bases']
+TEAMS = ['NYY', 'BOS', 'LAD', 'SF', 'CHC', 'STL']
+PLAYERS = [f'Player Number {i}' for i in range(60)]
+
+def build_slate(pick_type, events, books, picks):
+    slate = []
+    for e in range(events):
+        for _ in range(books):
+            book = []
+            for i in range(picks):
+                # Slicing and lower() produce a fresh string for every pick, like the parsers do
+                market = MARKETS[i % len(MARKETS)].lower().replace(' ', '_')
+                team = TEAMS[(e + i) % len(TEAMS)][:3]
+                player = PLAYERS[i % len(PLAYERS)][:]
+                outcome = ('Over' if i % 2 else 'Under').lower()
+                player = f'{player}'.strip() if i % 3 else None
+                book.append(pick_type(market, team, 0.5 + i % 10, -110 + i % 40, outcome, player))
+            slate.append(book)
+    return slate
+
+def measure(pick_type, events, books, picks):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    slate = build_slate(pick_type, events, books, picks)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = sum(len(book) for book in slate)
+    return count, (after - before) / count
+
+def run(events, books, picks):
+    for name, pick_type in (('dict-backed', DictPick), ('ScrapedPick', ScrapedPick)):
+        count, per_pick = measure(pick_type, events, books, picks)
+        print(f'{name:>12}: {count} picks, {per_pick:7.1f} bytes/pick, {count * per_pick / 1024 ** 2:7.2f} MiB')
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--events', type=int, default=15)
+    parser.add_argument('--books', type=int, default=4)
+    parser.add_argument('--picks', type=int, default=600)
+    args = parser.parse_args()
+    run(args.events, args.books, args.picks)
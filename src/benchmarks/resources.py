@@ -0,0 +1,55 @@
+'''
+Measures the bytes and load time saved per page by a resource blocking profile.
+
+Usage:
+    python -m benchmarks.resources <book> <url> [<url> ...] [--profile aggressive] [--runs N]
+'''
+from selenium.webdriver.chromium.webdriver import ChromiumDriver
+from config import Config
+import argparse
+import statistics
+
+from scraper.resources import apply_resource_rules, get_page_metrics
+
+def load_pages(book, urls, profile, runs):
+    Config.BLOCK_RESOURCES = profile
+    driver = Config.get_driver()
+    metrics = {url: [] for url in urls}
+    try:
+        if isinstance(driver, ChromiumDriver):
+            # Every load should hit the network, otherwise the later runs are free
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setCacheDisabled', {'cacheDisabled': True})
+        apply_resource_rules(driver, book)
+        for _ in range(runs):
+            for url in urls:
+                driver.get(url)
+                metrics[url].append(get_page_metrics(driver))
+    finally:
+        driver.quit()
+    return metrics
+
+def run(book, urls, profile, runs):
+    baseline = load_pages(book, urls, 'none', runs)
+    blocked = load_pages(book, urls, profile, runs)
+
+    for url in urls:
+        base_bytes = statistics.mean(m['bytes'] for m in baseline[url])
+        base_ms = statistics.mean(m['load_ms'] for m in baseline[url])
+        blocked_bytes = statistics.mean(m['bytes'] for m in blocked[url])
+        blocked_ms = statistics.mean(m['load_ms'] for m in blocked[url])
+        print(url)
+        print(
+            f'  none: {base_bytes / 1024:9.1f} KiB {base_ms:8.0f} ms | '
+            f'{profile}: {blocked_bytes / 1024:9.1f} KiB {blocked_ms:8.0f} ms | '
+            f'saved {(base_bytes - blocked_bytes) / 1024:9.1f} KiB {base_ms - blocked_ms:8.0f} ms'
+        )
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('book', help='Book whose rules are applied, or `espn` for schedule pages')
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--profile', default='aggressive')
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+    run(args.book, args.urls, args.profile, args.runs)
@@ -11,6 +11,11 @@ import os
 
 load_dotenv()
 
+def get_book_amounts(name):
+	# Parses `book:amount` pairs, e.g. `betmgm:500,draftkings:250`
+	pairs = [pair.split(':') for pair in os.getenv(name, '').split(',') if pair]
+	return {book.strip(): float(amount) for book, amount in pairs}
+
 class Config:
 	# WebDriver Configuration
 	BROWSER = os.getenv('BROWSER', 'chrome') 
@@ -18,6 +23,8 @@ class Config:
 	WEBDRIVER_PATH = os.getenv('WEBDRIVER_PATH')
 	WEBDRIVER_WAIT_TIME = int(os.getenv('WEBDRIVER_WAIT_TIME') or 10)
 	WEBDRIVER_THREADS = int(os.getenv('WEBDRIVER_THREADS') or 3)
+	# Resource blocking profile: `none`, `media` or `aggressive` (see `RESOURCE_PROFILES`)
+	BLOCK_RESOURCES = os.getenv('BLOCK_RESOURCES', 'none').lower()
 
 	@staticmethod
 	def get_driver() -> WebDriver:
@@ -60,6 +67,15 @@ class Config:
 					options.add_argument("--disable-infobars")
 					options.add_argument("--ignore-certificate-errors")
 
+				# Geckodriver has no `Network.setBlockedURLs`, so block by resource type instead
+				if Config.BLOCK_RESOURCES in ['media', 'aggressive']:
+					options.set_preference('permissions.default.image', 2)
+					options.set_preference('browser.display.use_document_fonts', 0)
+					options.set_preference('media.autoplay.default', 5)
+				if Config.BLOCK_RESOURCES == 'aggressive':
+					options.set_preference('privacy.trackingprotection.enabled', True)
+					options.set_preference('privacy.trackingprotection.socialtracking.enabled', True)
+
 				if Config.WEBDRIVER_PATH:
 					service = FirefoxService(Config.WEBDRIVER_PATH)
 				else:
@@ -72,10 +88,68 @@ class Config:
 
 	# Scraper Configuration
 	SCRAPING_INTERVAL = int(os.getenv('SCRAPING_INTERVAL') or 60)
+	# Keep the WebDriver pool warm and run a cycle every `SCRAPING_INTERVAL` seconds
+	DAEMON = os.getenv('DAEMON', 'False').lower() in ['true', '1', 't']
+	# Expand and extract event page blocks with one `execute_script` call instead of several per block
+	BATCH_EXTRACTION = os.getenv('BATCH_EXTRACTION', 'False').lower() in ['true', '1', 't']
+	# Worker processes that parse event pages, 0 parses on the driver threads
+	PARSER_PROCESSES = int(os.getenv('PARSER_PROCESSES') or 2)
+	# Parsed blocks kept by content hash so unchanged blocks are not parsed again, 0 disables it
+	PARSE_CACHE_SIZE = int(os.getenv('PARSE_CACHE_SIZE') or 20000)
+	# Seconds a league's schedule is reused before ESPN is scraped again, 0 disables the cache
+	SCHEDULE_CACHE_TTL = int(os.getenv('SCHEDULE_CACHE_TTL') or 3600)
+	# Seconds a book's event URLs are reused before its league page is scraped again
+	EVENT_URL_CACHE_TTL = int(os.getenv('EVENT_URL_CACHE_TTL') or 1800)
+	CACHE_DIR = os.getenv('CACHE_DIR', 'data/cache')
+	# Seconds between scrapes of an event that is live, starting within an hour, today or later
+	LIVE_REFRESH_INTERVAL = int(os.getenv('LIVE_REFRESH_INTERVAL') or 0)
+	SOON_REFRESH_INTERVAL = int(os.getenv('SOON_REFRESH_INTERVAL') or 60)
+	TODAY_REFRESH_INTERVAL = int(os.getenv('TODAY_REFRESH_INTERVAL') or 300)
+	LATER_REFRESH_INTERVAL = int(os.getenv('LATER_REFRESH_INTERVAL') or 1800)
 	LEAGUES = os.getenv('LEAGUES', '').split(',')
 	BOOKS =  os.getenv('BOOKS', '').split(',')
 
+	# Arbitrage Configuration
+	# Total stake that the stakes of each arbitrage opportunity are split from
+	ARBITRAGE_INVESTMENT = float(os.getenv('ARBITRAGE_INVESTMENT') or 100)
+	ARBITRAGE_BANKROLL = float(os.getenv('ARBITRAGE_BANKROLL') or 1000)
+	# Opportunities kept in the live feed and how they are ranked: `roi`, or `profit` within the bankroll and book limits
+	FEED_SIZE = int(os.getenv('FEED_SIZE') or 10)
+	FEED_RANK = os.getenv('FEED_RANK', 'roi').lower()
+	# Funds available and the largest single stake accepted at each book, unlimited if unset
+	BOOK_BALANCES = get_book_amounts('BOOK_BALANCES')
+	BOOK_MAX_BETS = get_book_amounts('BOOK_MAX_BETS')
+	# Stakes are rounded down to a multiple of this, 0 keeps them fractional
+	STAKE_ROUNDING = float(os.getenv('STAKE_ROUNDING') or 1)
+	# Smallest edge over the no-vig consensus of a reported +EV pick, in percent
+	EV_THRESHOLD = float(os.getenv('EV_THRESHOLD') or 2)
+	# `median` of all books, or the name of the sharp book the fair line is taken from
+	EV_CONSENSUS = os.getenv('EV_CONSENSUS', 'median').lower()
+	EV_MIN_BOOKS = int(os.getenv('EV_MIN_BOOKS') or 3)
+	# Largest worst-case loss of a reported middle, in percent of the investment
+	MIDDLE_MAX_LOSS = float(os.getenv('MIDDLE_MAX_LOSS') or 5)
+	# Widest window between the lines of a reported middle, unlimited if unset
+	MIDDLE_MAX_WIDTH = float(os.getenv('MIDDLE_MAX_WIDTH')) if os.getenv('MIDDLE_MAX_WIDTH') else None
+
 	# Database Configuration
+	# Most rows written per query by the bulk persistence of a cycle
+	DB_BATCH_SIZE = int(os.getenv('DB_BATCH_SIZE') or 2000)
+	# Cycles queued for the database writer thread before the scraper waits for it
+	DB_WRITE_QUEUE_SIZE = int(os.getenv('DB_WRITE_QUEUE_SIZE') or 4)
+	# SQLite connection profile, WAL lets the API read while the scraper writes
+	DB_JOURNAL_MODE = os.getenv('DB_JOURNAL_MODE', 'wal').lower()
+	DB_SYNCHRONOUS = os.getenv('DB_SYNCHRONOUS', 'normal').lower()
+	# Bytes of the database file memory-mapped for reads, 0 disables it
+	DB_MMAP_SIZE = int(os.getenv('DB_MMAP_SIZE') or 268435456)
+	# KiB of page cache per connection
+	DB_CACHE_SIZE = int(os.getenv('DB_CACHE_SIZE') or 65536)
+	# Milliseconds a connection waits for a lock before failing with "database is locked"
+	DB_BUSY_TIMEOUT = int(os.getenv('DB_BUSY_TIMEOUT') or 5000)
+	# Hours after which odds history is downsampled to one price per interval of minutes
+	HISTORY_DOWNSAMPLE_AFTER = float(os.getenv('HISTORY_DOWNSAMPLE_AFTER') or 24)
+	HISTORY_DOWNSAMPLE_INTERVAL = float(os.getenv('HISTORY_DOWNSAMPLE_INTERVAL') or 15)
+	# Days after which odds history is deleted
+	HISTORY_RETENTION = float(os.getenv('HISTORY_RETENTION') or 30)
 
 	# Debug
 	LOG_LEVEL = os.getenv('LOG_LEVEL', 'DEBUG').upper()
\ No newline at end of file
@@ -78,6 +78,11 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Writers take the lock when their transaction begins, so it waits for the busy
+            # timeout instead of failing when a read has to become a write
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
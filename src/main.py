@@ -1,5 +1,6 @@
 from config import Config
-from scraper import scrape_odds
+from scraper import scrape_odds, DriverPool, ParserPool, ScheduleCache, EventUrlCache, RefreshPolicy
+from arb import ArbitrageTracker, OpportunityFeed, OddsSnapshot, find_middles, find_positive_ev, optimize_stakes
 from utils import logger
 import os
 import json
@@ -9,16 +10,111 @@ import time
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 django.setup()
 
-from api.models import Event, Sportsbook, Pick
+from api.writer import DatabaseWriter
+
+def run_cycle(tracker, feed, db_writer, **components):
+    def on_book(event, book):
+        # Opportunities enter the feed as soon as each book is parsed, not after the cycle
+        feed.update(tracker.apply_book(event, book))
 
-def main():
     try:
-        odds = scrape_odds(Config.LEAGUES, Config.BOOKS, Config.WEBDRIVER_THREADS)
+        odds = scrape_odds(Config.LEAGUES, Config.BOOKS, Config.WEBDRIVER_THREADS, on_book=on_book, **components)
     except Exception as e:
         logger.critical(f'Failed to scrape odds: {e}', exc_info=True)
+        return
 
     with open('data/export.json', 'w') as f:
         json.dump([o.to_dict() for o in odds], f, indent=4)
 
+    # Saved by the writer thread while the opportunities are evaluated
+    db_writer.submit(odds)
+
+    # One failing evaluation must not stop the others or the daemon
+    for name, evaluate in [
+        ('arbitrage', lambda: report_arbitrage(tracker, feed, odds)),
+        ('middles', lambda: report_middles(odds)),
+        ('+EV picks', lambda: report_positive_ev(odds)),
+    ]:
+        try:
+            evaluate()
+        except Exception as e:
+            logger.error(f'Failed to evaluate {name}: {e}', exc_info=True)
+
+def report_arbitrage(tracker, feed, odds):
+    # Every book was already applied while streaming, this drops finished events and missing books
+    feed.update(tracker.sync(odds))
+    logger.info(f'{len(tracker.opportunities)} open arbitrage opportunities')
+    for arbitrage in feed.top():
+        logger.info(f'Top arbitrage: {arbitrage}')
+    with open('data/arbitrage.json', 'w') as f:
+        json.dump([a.to_dict() for a in tracker.opportunities.values()], f, indent=4)
+
+    allocations = optimize_stakes(
+        list(tracker.opportunities.values()), Config.ARBITRAGE_BANKROLL,
+        Config.BOOK_BALANCES, Config.BOOK_MAX_BETS, Config.STAKE_ROUNDING,
+    )
+    logger.info(
+        f'Staking {sum(a.stake for a in allocations):.2f} on {len(allocations)} opportunities '
+        f'for {sum(a.profit for a in allocations):.2f} guaranteed profit'
+    )
+    with open('data/stakes.json', 'w') as f:
+        json.dump([a.to_dict() for a in allocations], f, indent=4)
+
+def report_middles(odds):
+    middles = find_middles(odds, Config.ARBITRAGE_INVESTMENT, Config.MIDDLE_MAX_LOSS, Config.MIDDLE_MAX_WIDTH)
+    logger.info(f'Found {len(middles)} middles')
+    with open('data/middles.json', 'w') as f:
+        json.dump([m.to_dict() for m in middles], f, indent=4)
+
+def report_positive_ev(odds):
+    snapshot = OddsSnapshot.from_events(odds)
+    positive_ev = find_positive_ev(snapshot, Config.EV_THRESHOLD, Config.EV_CONSENSUS, Config.EV_MIN_BOOKS)
+    logger.info(f'Found {len(positive_ev)} +EV picks in {len(snapshot)} picks')
+    with open('data/ev.json', 'w') as f:
+        json.dump([p.to_dict() for p in positive_ev], f, indent=4)
+
+def main():
+    pool = DriverPool(Config.WEBDRIVER_THREADS)
+    parser = ParserPool(Config.PARSER_PROCESSES, Config.PARSE_CACHE_SIZE)
+    # Kept alive across cycles so daemon mode reuses warm drivers, workers and caches
+    components = {
+        'pool': pool,
+        'parser': parser,
+        'schedule_cache': ScheduleCache.from_config(),
+        'event_url_cache': EventUrlCache.from_config(),
+        'refresh_policy': RefreshPolicy.from_config(),
+    }
+    # Open opportunities carry over between cycles, only the picks that changed are re-evaluated
+    tracker = ArbitrageTracker(Config.ARBITRAGE_INVESTMENT)
+    feed = OpportunityFeed.from_config()
+    feed.on_enter.append(lambda arbitrage: logger.info(f'New top arbitrage: {arbitrage}'))
+    # Saves each cycle from its own thread, writing only the picks that changed since the last one
+    db_writer = DatabaseWriter().start()
+    try:
+        if not Config.DAEMON:
+            run_cycle(tracker, feed, db_writer, **components)
+            return
+
+        logger.info(f'Running in daemon mode every {Config.SCRAPING_INTERVAL}s')
+        while True:
+            cycle_start = time.time()
+            replaced = pool.health_check()
+            if replaced:
+                logger.info(f'Replaced {replaced} WebDriver(s) before cycle')
+
+            run_cycle(tracker, feed, db_writer, **components)
+
+            elapsed = time.time() - cycle_start
+            if elapsed > Config.SCRAPING_INTERVAL:
+                logger.warning(f'Cycle took {elapsed:.1f}s, longer than the {Config.SCRAPING_INTERVAL}s interval')
+            time.sleep(max(0, Config.SCRAPING_INTERVAL - elapsed))
+    except KeyboardInterrupt:
+        logger.info('Stopping daemon...')
+    finally:
+        logger.info('Quitting...')
+        db_writer.stop()
+        parser.shutdown()
+        pool.quit()
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,7 +1,12 @@
 from .base_scraper import BaseScraper
 from .betmgm_scraper import BetMGMScraper
 from .draftkings_scraper import DraftKingsScraper
-from concurrent.futures import ThreadPoolExecutor
+from .cache import ScheduleCache, EventUrlCache
+from .driver_pool import DriverPool
+from .parser_pool import ParserPool
+from .priority import RefreshPolicy
+from .registry import EventRegistry
+from .scheduler import ScrapeScheduler
 from config import Config
 from utils import logger
 import time
@@ -18,46 +23,51 @@ def get_book_scraper(book_name) -> BaseScraper:
     }
     return BOOK_SCRAPERS.get(book_name)
 
-def scrape_odds(leagues, books, threads):
-    events = []
-    # WebDriver at index 0 is used to scrape the upcoming schedule
-    book_drivers = [Config.get_driver() for _ in range(threads)]
+def scrape_odds(
+    leagues, books, threads, pool: DriverPool = None, parser: ParserPool = None,
+    schedule_cache: ScheduleCache = None, event_url_cache: EventUrlCache = None,
+    refresh_policy: RefreshPolicy = None, on_book=None,
+):
+    book_scrapers = {}
+    for book in books:
+        book_scraper = get_book_scraper(book)
+        if book_scraper is None:
+            logger.warning(f'Book `{book}` is not supported')
+            continue
+        book_scrapers[book] = book_scraper()
+
+    # Without a pool the drivers only live for this cycle
+    owns_pool = pool is None
+    if owns_pool:
+        pool = DriverPool(threads)
+    owns_parser = parser is None
+    if owns_parser:
+        parser = ParserPool(Config.PARSER_PROCESSES, Config.PARSE_CACHE_SIZE)
+    if schedule_cache is None:
+        schedule_cache = ScheduleCache.from_config()
+    if event_url_cache is None:
+        event_url_cache = EventUrlCache.from_config()
+    if refresh_policy is None:
+        refresh_policy = RefreshPolicy.from_config()
 
     start_time = time.time()
-    for league in leagues:
-        logger.info(f'Scraping league `{league}`')
-        league_events = BaseScraper.scrape_scheduled_events(league, book_drivers[0])
-        for book in books:
-            logger.info(f'Scraping book `{book}`')
-            book_scraper = get_book_scraper(book)()
-            event_urls = book_scraper.scrape_event_urls(league, league_events, book_drivers[0])
-            # Evenly distribute event URLs to each driver
-            avg, remainder = divmod(len(event_urls), threads)
-            event_url_slices = [
-                event_urls[i * avg + min(i, remainder):(i + 1) * avg + min(i + 1, remainder)] for i in range(threads)
-            ]
-            for i, s in enumerate(event_url_slices):
-                u = [f'- {t[1]}' for t in s]
-                logger.info(f'Driver {i + 1} Queue:\n{'\n'.join(u)}')
+    try:
+        events = ScrapeScheduler(
+            pool, leagues, book_scrapers, parser, schedule_cache, event_url_cache, refresh_policy, on_book
+        ).run()
+    finally:
+        if owns_parser:
+            parser.shutdown()
+        if owns_pool:
+            logger.info('Quitting...')
+            pool.quit()
 
-            with ThreadPoolExecutor(threads) as thread:
-                try:
-                    results = thread.map(book_scraper.scrape_events, league, event_url_slices, book_drivers)
-                    for result in results:
-                        for event, picks in result:
-                            book_scraper._add_picks_to_matching_event(event, league_events, picks)
-                except Exception as e:
-                    logger.critical(f'{type(e).__name__} encountered while scraping event pool')
-        events.extend(league_events)
-    
     logger.info(f'Execution Time: {time.time() - start_time}s')
-    
-    logger.info('Quitting...')
-    for bd in book_drivers:
-        bd.quit()
-    
+
     return events
 
 __all__ = [
-    'scrape_odds', 'BaseScraper', 'BetMGMScraper', 'DraftKingsScraper',
+    'scrape_odds', 'BaseScraper', 'BetMGMScraper', 'DraftKingsScraper', 'DriverPool',
+    'ParserPool', 'ScrapeScheduler', 'ScheduleCache',
+    'EventUrlCache', 'RefreshPolicy', 'EventRegistry',
 ]
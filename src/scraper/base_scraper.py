@@ -11,6 +11,7 @@ import time
 from utils import logger
 
 from .models import ScrapedEvent, ScrapedBook, ScrapedPick
+from .resources import apply_resource_rules
 
 from utils import LEAGUES, TEAM_ACRONYMS, SCHEDULE_BASE_URL, BOOK_BASE_URL, MARKET_MAPPINGS
 
@@ -20,28 +21,17 @@ class BaseScraper(ABC):
         self.book_name = book_name
         self.book_domain = book_domain
 
-    def scrape_events(self, league, event_urls, driver: WebDriver) -> tuple[ScrapedEvent, list[ScrapedPick]]:
-        event_picks = []
-        for event, url in event_urls:
-            try:
-                logger.info(f'Scraping event `{event}`')
-                picks = self.scrape_event_page(league, event, url, driver)
-                event_picks.append((event, picks))
-            except Exception as e:
-                logger.error(f'{type(e).__name__} encountered while scraping `{event} in `{self.book_name}`: {e}')
-        return event_picks
-
     @abstractmethod
     def scrape_event_urls(self, league, events, driver):
         pass
 
-    @abstractmethod
-    def scrape_event_page(self, event, url, driver) -> list[ScrapedPick]:
+    def scrape_event_page(self, league, event, url, driver) -> list[ScrapedPick]:
         '''
         Scrapes an event page for a certain sportsbook.
 
         This function scrapes all available game and player prop odds for this event,
-        and stores the data in a list.
+        and stores the data in a list. It fetches the page with `fetch_event_page` and
+        parses it with `parse_event_page` on the calling thread.
 
         Paramters:
             event (ScrapedEvent): The event information.
@@ -51,6 +41,60 @@ class BaseScraper(ABC):
             list[ScrapedPick]: 
            
         '''
+        return self.parse_event_page(league, event, self.fetch_event_page(league, event, url, driver))
+
+    @abstractmethod
+    def fetch_event_page(self, league, event, url, driver) -> list[str]:
+        '''
+        Loads an event page and returns its raw HTML without parsing it.
+
+        Only browser work should happen here, so that the CPU-bound parsing can run
+        in another process.
+
+        Args:
+            league (str): The league of the event.
+            event (ScrapedEvent): The event information.
+            url (str): The url of the event page on this sportsbook.
+            driver (WebDriver): The webdriver used to load the page.
+
+        Returns:
+            list[str]: The HTML of each market block on the page.
+        '''
+        pass
+
+    def parse_event_page(self, league, event, page) -> list[ScrapedPick]:
+        '''
+        Parses the raw HTML returned by `fetch_event_page` into picks.
+
+        This must not use the webdriver, and the scraper instance must be picklable,
+        since it may run inside a worker process.
+
+        Args:
+            league (str): The league of the event.
+            event (ScrapedEvent): The event information.
+            page (list[str]): The HTML of each market block on the page.
+
+        Returns:
+            list[ScrapedPick]: The picks found on the page.
+        '''
+        return [pick for html in page for pick in self.parse_block(league, event, html)]
+
+    @abstractmethod
+    def parse_block(self, league, event, html) -> list[ScrapedPick]:
+        '''
+        Parses the HTML of a single market block into picks.
+
+        The result must only depend on the league and the HTML, so that blocks whose
+        content has not changed can reuse an earlier result.
+
+        Args:
+            league (str): The league of the event.
+            event (ScrapedEvent): The event information, only used for logging.
+            html (str): The HTML of the block.
+
+        Returns:
+            list[ScrapedPick]: The picks found in the block.
+        '''
         pass
 
     @staticmethod
@@ -70,6 +114,7 @@ class BaseScraper(ABC):
         '''
         events = []
         schedule_url = BaseScraper._get_schedule_base_url(league)
+        apply_resource_rules(driver, 'espn')
         driver.get(schedule_url)
         BaseScraper._locate_element_with_retries(driver, By.CSS_SELECTOR, 'div.ResponsiveTable')
         html = driver.page_source
@@ -116,25 +161,44 @@ class BaseScraper(ABC):
 
     def _add_picks_to_matching_event(self, event, events, picks):
         '''
-        Appends the given picks to the matching event in the list of events.
+        Appends the given picks to the matching event in the registry of events.
 
-        This method searches through the list of events and appends the provided picks 
-        to the event that matches the specified away team, home team, and event time.
+        This method looks up the event that matches the specified away team, home team,
+        and event time, and appends the provided picks to it.
 
         Args:
             event (Event): The event to be matched.
-            events (list): List of Events.
+            events (EventRegistry): Registry of Events.
             picks (list): List of Picks to be added to the matching event.
 
+        Returns:
+            ScrapedBook: The book holding the picks that was added to the matching event.
+
         Raises:
-            ValueError: If no matching event is found in the list of events.
+            ValueError: If no matching event is found in the registry of events.
         '''
-        for e in events:
-            if e == event:
-                e.books.append(ScrapedBook(self.book_name, picks))
-                return
-        
-        raise ValueError(f'Matching event {event} not found.')
+        book = ScrapedBook(self.book_name, picks)
+        self._add_book_to_matching_event(event, events, book)
+        return book
+
+    @staticmethod
+    def _add_book_to_matching_event(event, events, book: ScrapedBook):
+        '''
+        Appends an already scraped book to the matching event in the registry of events.
+
+        Args:
+            event (Event): The event to be matched.
+            events (EventRegistry): Registry of Events.
+            book (ScrapedBook): The book to be added to the matching event.
+
+        Raises:
+            ValueError: If no matching event is found in the registry of events.
+        '''
+        match = events.find(event)
+        if match is None:
+            raise ValueError(f'Matching event {event} not found.')
+
+        match.books.append(book)
 
 
     def _get_book_base_url(self, league):
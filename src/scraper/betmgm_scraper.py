@@ -8,6 +8,7 @@ import time
 
 from .base_scraper import BaseScraper
 from .models import ScrapedEvent, ScrapedPick
+from .resources import apply_resource_rules
 
 from utils import (
     logger,
@@ -18,6 +19,31 @@ from utils import (
 
 class BetMGMScraper(BaseScraper):
 
+    # Expands closed blocks, clicks each block's `Show More` button and returns every block's HTML.
+    # Options are rendered asynchronously after a click, so each step waits `arguments[0]` ms.
+    EXTRACT_BLOCKS_SCRIPT = '''
+        const delay = arguments[0];
+        const done = arguments[arguments.length - 1];
+        const blocks = Array.from(document.querySelectorAll('ms-option-panel.option-panel'));
+        for (const block of blocks) {
+            const chevron = block.querySelector('div.option-group-header-chevron span');
+            const header = block.querySelector('div.option-group-name.clickable');
+            if (chevron && header && chevron.className === 'theme-down') {
+                header.click();
+            }
+        }
+        setTimeout(() => {
+            for (const block of blocks) {
+                const showMore = block.querySelector('div.show-more-less-button');
+                if (showMore && /more/i.test(showMore.textContent)) {
+                    showMore.click();
+                }
+            }
+            setTimeout(() => done(blocks.map(block => block.innerHTML)), delay);
+        }, delay);
+    '''
+    EXTRACT_BLOCKS_DELAY_MS = 250
+
     def __init__(self):
         # TODO: Handle different states
         super().__init__('betmgm', 'https://sports.il.betmgm.com')
@@ -78,6 +104,7 @@ class BetMGMScraper(BaseScraper):
         return datetime.combine(event_date, event_time)
 
     def scrape_event_urls(self, league, events, driver: WebDriver):
+        apply_resource_rules(driver, self.book_name)
         driver.get(self._get_book_base_url(league))
         driver.execute_script('window.scrollTo(0, document.body.scrollHeight);')
 
@@ -106,7 +133,8 @@ class BetMGMScraper(BaseScraper):
         
         return event_urls
 
-    def scrape_event_page(self, league, event, url, driver: WebDriver):
+    def fetch_event_page(self, league, event, url, driver: WebDriver):
+        apply_resource_rules(driver, self.book_name)
         driver.get(url)
         try:
             # Click `All` button to show all available betting props
@@ -126,7 +154,10 @@ class BetMGMScraper(BaseScraper):
             logger.error(f'Unable to load event blocks in event `{event}')
             raise EventNotFoundError(f'Unable to load event blocks in event `{event}') from e
 
-        block_soup = []
+        if Config.BATCH_EXTRACTION:
+            return self._extract_blocks(driver, event)
+
+        block_html = []
         for block in blocks:
             try:
                 # If the block is closed, expand it
@@ -149,34 +180,52 @@ class BetMGMScraper(BaseScraper):
                 logger.error(f'{type(e).__name__} encountered while clicking `Show More` in `{event}`: {e}')
 
             # Save block HTML info
-            block_soup.append(BeautifulSoup(
-                block.get_attribute('innerHTML'), 'lxml'
-                )
-            )
+            block_html.append(block.get_attribute('innerHTML'))
 
-        # Scrape each block
-        event_picks = []
-        for soup in block_soup:
-            try:
-                block_type = soup.select_one('div.option-group-container')['class'][1]
-                logger.info(f'Scraping block `{block_type}`')
-                match block_type:
-                    case 'six-pack-container':
-                        event_picks.extend(self._scrape_six_pack_container(soup, league))
-                    case 'over-under-container':
-                        event_picks.extend(self._scrape_over_under_container(soup))
-                    case 'player-props-container':
-                        event_picks.extend(self._scrape_player_prop_container(soup))
-                    case 'regular-option-container':
-                        event_picks.extend(self._scrape_regular_option_container(soup))
-                    case 'spread-container':
-                        event_picks.extend(self._scrape_spread_container(soup, league))
-                    case _:
-                        raise UnsupportedBlockType(f'{block_type} is not supported')
-            except Exception as e:
-                logger.error(f'{type(e).__name__} encountered while scraping `{block_type}` in `{event}`: {e}')
+        return block_html
+
+    def _extract_blocks(self, driver: WebDriver, event):
+        '''
+        Expands every block and collects the HTML of all blocks in a single WebDriver call.
 
-        return event_picks
+        The per-block approach costs several chromedriver round trips per block, which adds up
+        to hundreds of HTTP calls on large event pages. This runs the same steps in the browser.
+
+        Args:
+            driver (WebDriver): The webdriver with the event page loaded.
+            event (ScrapedEvent): The event information.
+
+        Returns:
+            list[str]: The HTML of each block on the page.
+        '''
+        try:
+            return driver.execute_async_script(self.EXTRACT_BLOCKS_SCRIPT, self.EXTRACT_BLOCKS_DELAY_MS)
+        except Exception as e:
+            logger.error(f'{type(e).__name__} encountered while extracting blocks in event `{event}`: {e}')
+            raise EventNotFoundError(f'Unable to extract event blocks in event `{event}`') from e
+
+    def parse_block(self, league, event, html):
+        block_type = None
+        try:
+            soup = BeautifulSoup(html, 'lxml')
+            block_type = soup.select_one('div.option-group-container')['class'][1]
+            logger.info(f'Scraping block `{block_type}`')
+            match block_type:
+                case 'six-pack-container':
+                    return self._scrape_six_pack_container(soup, league)
+                case 'over-under-container':
+                    return self._scrape_over_under_container(soup)
+                case 'player-props-container':
+                    return self._scrape_player_prop_container(soup)
+                case 'regular-option-container':
+                    return self._scrape_regular_option_container(soup)
+                case 'spread-container':
+                    return self._scrape_spread_container(soup, league)
+                case _:
+                    raise UnsupportedBlockType(f'{block_type} is not supported')
+        except Exception as e:
+            logger.error(f'{type(e).__name__} encountered while scraping `{block_type}` in `{event}`: {e}')
+            return []
 
     def _scrape_six_pack_container(self, soup: BeautifulSoup, league):
         game_lines = []
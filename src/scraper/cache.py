@@ -0,0 +1,239 @@
+from collections import OrderedDict
+from datetime import datetime
+from config import Config
+from utils import logger
+import threading
+import hashlib
+import json
+import time
+import os
+
+from .models import ScrapedEvent, ScrapedPick
+from .registry import EventRegistry
+
+class PersistentCache:
+    '''
+    Base class for caches that keep JSON-serializable entries in memory and on disk.
+    '''
+
+    def __init__(self, ttl, path=None):
+        self.ttl = ttl
+        self.path = path
+        self._entries = {}
+        self._lock = threading.Lock()
+        if path:
+            self._load()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        self._save()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                self._entries = json.load(f)
+        except FileNotFoundError:
+            pass
+        except (ValueError, TypeError) as e:
+            logger.warning(f'Ignoring unreadable cache `{self.path}`: {e}')
+
+    def _save(self):
+        if not self.path:
+            return
+
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            # Write to a temporary file first so a crash never leaves a truncated cache
+            tmp_path = f'{self.path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+
+class ScheduleCache(PersistentCache):
+    '''
+    Caches the scheduled events of each league, persisted to disk between runs.
+
+    The ESPN schedule only changes a few times a day, so a league's schedule is reused until
+    its TTL expires or one of its events should have gone live. Every `get` returns fresh
+    `ScrapedEvent` objects, so picks attached during a cycle never leak into the next one.
+    '''
+
+    def get(self, league, now: datetime = None) -> list[ScrapedEvent] | None:
+        '''
+        Returns the cached schedule of a league if it is still valid.
+
+        Args:
+            league (str): The league of the schedule.
+            now (datetime, optional): The current time, used to detect events that have started.
+
+        Returns:
+            list[ScrapedEvent]: The cached events, or None if the schedule must be scraped again.
+        '''
+        with self._lock:
+            entry = self._entries.get(league)
+        if entry is None:
+            return None
+
+        # [time the schedule was scraped, event dicts]
+        fetched_at, event_dicts = entry
+        if time.time() - fetched_at > self.ttl:
+            logger.debug(f'Schedule cache for `{league}` expired')
+            return None
+
+        events = [ScrapedEvent.from_dict(e) for e in event_dicts]
+        now = now or datetime.now()
+        for event in events:
+            # The cached event should be live by now, its state and start time will have changed
+            if not event.active and event.start_time <= now:
+                logger.debug(f'Schedule cache for `{league}` invalidated, `{event}` has started')
+                self.invalidate(league)
+                return None
+
+        return events
+
+    def put(self, league, events: list[ScrapedEvent]):
+        if self.ttl <= 0:
+            return
+
+        event_dicts = [
+            {k: v for k, v in e.to_dict().items() if k not in ('id', 'books')} for e in events
+        ]
+        with self._lock:
+            self._entries[league] = [time.time(), event_dicts]
+        self._save()
+
+    @classmethod
+    def from_config(cls):
+        return cls(Config.SCHEDULE_CACHE_TTL, os.path.join(Config.CACHE_DIR, 'schedule.json'))
+
+class EventUrlCache(PersistentCache):
+    '''
+    Caches the event page URLs of each (book, league), keyed by the ID of the scheduled event.
+
+    Event URLs rarely change, so the book's league page only has to be scraped again when
+    the TTL expires or the schedule contains an event that was not on it at the last refresh.
+    '''
+
+    def get(self, book, league, events: list[ScrapedEvent]) -> list[tuple[ScrapedEvent, str]] | None:
+        '''
+        Returns the cached event URLs for the scheduled events of a league.
+
+        Args:
+            book (str): The book the URLs belong to.
+            league (str): The league of the events.
+            events (list[ScrapedEvent]): The scheduled events of the league.
+
+        Returns:
+            list[tuple[ScrapedEvent, str]]: `(event, url)` tuples for every scheduled event found on
+                the book, or None if the book's league page must be scraped again.
+        '''
+        with self._lock:
+            entry = self._entries.get(f'{book}:{league}')
+        if entry is None:
+            return None
+
+        # [time the URLs were scraped, {event id: url}, event ids on the schedule at that time]
+        fetched_at, urls, seen = entry
+        if time.time() - fetched_at > self.ttl:
+            logger.debug(f'Event URL cache for `{book}` `{league}` expired')
+            return None
+
+        seen = set(seen)
+        if any(event.id not in seen for event in events):
+            logger.debug(f'Event URL cache for `{book}` `{league}` is missing new scheduled events')
+            return None
+
+        return [(event, urls[event.id]) for event in events if event.id in urls]
+
+    def put(self, book, league, events: EventRegistry, event_urls: list[tuple[ScrapedEvent, str]]):
+        '''
+        Stores the event URLs scraped from a book's league page.
+
+        Args:
+            book (str): The book the URLs belong to.
+            league (str): The league of the events.
+            events (EventRegistry): The scheduled events of the league.
+            event_urls (list[tuple[ScrapedEvent, str]]): The `(event, url)` tuples scraped from the book.
+        '''
+        if self.ttl <= 0:
+            return
+
+        registry = events if isinstance(events, EventRegistry) else EventRegistry(events)
+        urls = {}
+        for book_event, url in event_urls:
+            event = registry.find(book_event)
+            if event is not None:
+                urls[event.id] = url
+
+        with self._lock:
+            self._entries[f'{book}:{league}'] = [time.time(), urls, [event.id for event in events]]
+        self._save()
+
+    @classmethod
+    def from_config(cls):
+        return cls(Config.EVENT_URL_CACHE_TTL, os.path.join(Config.CACHE_DIR, 'event_urls.json'))
+
+class ParseCache:
+    '''
+    An LRU cache from the content hash of a block, or of a whole page, to its parsed picks.
+
+    Odds on quiet pre-game markets rarely move, so most blocks come back with exactly the
+    same HTML as the previous cycle and can reuse the picks parsed back then.
+    '''
+
+    KINDS = ('page', 'block')
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = dict.fromkeys(self.KINDS, 0)
+        self._misses = dict.fromkeys(self.KINDS, 0)
+
+    @staticmethod
+    def hash_block(book, league, html):
+        # Team abbreviations depend on the league, so it is part of the key
+        digest = hashlib.blake2b(f'{book}|{league}|'.encode(), digest_size=16)
+        digest.update(html.encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_page(block_hashes):
+        return hashlib.blake2b('|'.join(block_hashes).encode(), digest_size=16).hexdigest()
+
+    def get(self, key, kind) -> list[ScrapedPick] | None:
+        with self._lock:
+            picks = self._entries.get(key)
+            if picks is None:
+                self._misses[kind] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits[kind] += 1
+            return picks
+
+    def put(self, key, picks: list[ScrapedPick]):
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = picks
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def hit_ratios(self):
+        '''
+        Returns the fraction of page and block lookups that were served from the cache.
+        '''
+        with self._lock:
+            return {
+                kind: self._hits[kind] / (self._hits[kind] + self._misses[kind])
+                if self._hits[kind] + self._misses[kind] else 0.0
+                for kind in self.KINDS
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = dict.fromkeys(self.KINDS, 0)
+            self._misses = dict.fromkeys(self.KINDS, 0)
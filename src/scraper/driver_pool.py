@@ -0,0 +1,145 @@
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.common.exceptions import WebDriverException
+from contextlib import contextmanager
+from config import Config
+from utils import logger
+import threading
+import queue
+
+class DriverPool:
+    '''
+    A fixed-size pool of warm WebDrivers that is kept alive across scraping cycles.
+
+    Starting a browser costs several seconds per driver, so the pool creates its drivers
+    once and hands them out to each cycle. Dead drivers are detected by `health_check`
+    and replaced with fresh ones before the next cycle starts.
+    '''
+
+    def __init__(self, size):
+        self.size = size
+        self._idle = queue.Queue()
+        self._drivers = []
+        self._lock = threading.Lock()
+        for _ in range(size):
+            self._add_driver()
+
+    def acquire(self, timeout=None) -> WebDriver:
+        '''
+        Takes an idle driver out of the pool, blocking until one is available.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait for a driver.
+
+        Returns:
+            WebDriver: An idle driver.
+
+        Raises:
+            queue.Empty: If no driver became available within `timeout` seconds.
+        '''
+        return self._idle.get(timeout=timeout)
+
+    def release(self, driver: WebDriver):
+        '''
+        Returns a driver to the pool so it can be used by another task.
+        '''
+        self._idle.put(driver)
+
+    @contextmanager
+    def driver(self, timeout=None):
+        driver = self.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def health_check(self):
+        '''
+        Checks every idle driver and replaces the ones whose browser session has died.
+
+        This should be called between cycles, while no task is holding a driver.
+
+        Returns:
+            int: The number of drivers that were replaced.
+        '''
+        replaced = 0
+        idle = []
+        while True:
+            try:
+                idle.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+        for driver in idle:
+            if self._is_alive(driver):
+                self._idle.put(driver)
+                continue
+
+            logger.warning('Replacing unresponsive WebDriver')
+            self._discard_driver(driver)
+            try:
+                self._add_driver()
+                replaced += 1
+            except Exception as e:
+                logger.error(f'{type(e).__name__} encountered while replacing WebDriver: {e}')
+
+        # Top the pool back up if a previous replacement failed
+        while len(self._drivers) < self.size:
+            try:
+                self._add_driver()
+                replaced += 1
+            except Exception as e:
+                logger.error(f'{type(e).__name__} encountered while replacing WebDriver: {e}')
+                break
+
+        return replaced
+
+    def quit(self):
+        '''
+        Quits every driver owned by the pool.
+        '''
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.warning(f'{type(e).__name__} encountered while quitting WebDriver: {e}')
+
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+    def __len__(self):
+        return len(self._drivers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.quit()
+
+    def _add_driver(self):
+        driver = Config.get_driver()
+        with self._lock:
+            self._drivers.append(driver)
+        self._idle.put(driver)
+
+    def _discard_driver(self, driver: WebDriver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver: WebDriver):
+        try:
+            # Any command that round-trips to the browser will do
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
@@ -1,15 +1,38 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import hashlib
+import sys
 
-class ScrapedEvent:
-    def __init__(self, league: str, away_team: str, home_team: str, start_time: str, active: bool = False):
-        self.league = league
-        self.away_team = away_team
-        self.home_team = home_team
-        self.start_time = start_time
-        self.active = active
-        self.id = self.generate_id()
-        self.books = []
+# Events from different sources are the same event if their start times are this close
+EVENT_TIME_TOLERANCE = timedelta(minutes=10)
+
+def _intern(value):
+    # Categorical strings repeat thousands of times per cycle, so share a single copy of each
+    return sys.intern(value) if isinstance(value, str) else value
+
+class Immutable:
+    '''
+    Base class for slotted objects whose attributes can only be set in `__init__`.
+    '''
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+class ScrapedEvent(Immutable):
+    __slots__ = ('league', 'away_team', 'home_team', 'start_time', 'active', 'id', 'books')
+
+    def __init__(self, league: str, away_team: str, home_team: str, start_time: datetime, active: bool = False):
+        object.__setattr__(self, 'league', _intern(league))
+        object.__setattr__(self, 'away_team', _intern(away_team))
+        object.__setattr__(self, 'home_team', _intern(home_team))
+        object.__setattr__(self, 'start_time', start_time)
+        object.__setattr__(self, 'active', active)
+        object.__setattr__(self, 'id', self.generate_id())
+        # The only mutable part of an event, books are attached as they are scraped
+        object.__setattr__(self, 'books', [])
 
     def __str__(self):
         return f'({self.league}) {self.away_team} vs. {self.home_team} - {self.start_time.isoformat()}'
@@ -20,11 +43,23 @@ class ScrapedEvent:
                 self.league == other.league
                 and self.away_team == other.away_team
                 and self.home_team == other.home_team
-                and (self.start_time - other.start_time).total_seconds() / 60 <= 10
+                and abs(self.start_time - other.start_time) <= EVENT_TIME_TOLERANCE
                 and self.active == other.active
             )
         return False
 
+    def __hash__(self):
+        # Equal events may differ in start time, so it cannot be part of the hash
+        return hash((self.league, self.away_team, self.home_team, self.active))
+
+    def __reduce__(self):
+        return (
+            type(self), (self.league, self.away_team, self.home_team, self.start_time, self.active), self.books
+        )
+
+    def __setstate__(self, books):
+        self.books.extend(books)
+
     def generate_id(self):
         event_string = self.__str__()
         return hashlib.sha256(event_string.encode()).hexdigest()
@@ -40,14 +75,27 @@ class ScrapedEvent:
             'books': [b.to_dict() for b in self.books]
         }
 
-class ScrapedPick:
-    def __init__(self, market: str, team: str, line: int, odds: float, outcome: str = None, player: str = None):
-        self.market = market
-        self.team = team
-        self.line = line
-        self.odds = odds
-        self.outcome = outcome
-        self.player = player
+    @classmethod
+    def from_dict(cls, data):
+        # Books are not restored, the event starts without any picks
+        return cls(
+            data['league'],
+            data['away_team'],
+            data['home_team'],
+            datetime.fromisoformat(data['start_time']),
+            data['active'],
+        )
+
+class ScrapedPick(Immutable):
+    __slots__ = ('market', 'team', 'line', 'odds', 'outcome', 'player')
+
+    def __init__(self, market: str, team: str, line: float, odds: int, outcome: str = None, player: str = None):
+        object.__setattr__(self, 'market', _intern(market))
+        object.__setattr__(self, 'team', _intern(team))
+        object.__setattr__(self, 'line', line)
+        object.__setattr__(self, 'odds', odds)
+        object.__setattr__(self, 'outcome', _intern(outcome))
+        object.__setattr__(self, 'player', _intern(player))
 
     def __str__(self):
         return f'{self.player} ({self.team}) {self.market}: {self.outcome} {self.line} ({self.odds})'
@@ -64,6 +112,12 @@ class ScrapedPick:
             )
         return False
 
+    def __hash__(self):
+        return hash((self.market, self.team, self.line, self.odds, self.outcome, self.player))
+
+    def __reduce__(self):
+        return type(self), (self.market, self.team, self.line, self.odds, self.outcome, self.player)
+
     def to_dict(self):
         return {
             'market': self.market,
@@ -75,9 +129,10 @@ class ScrapedPick:
         }
 
 class ScrapedBook:
-    def __init__(self, book_name: str, picks: list[ScrapedPick]):
+    def __init__(self, book_name: str, picks: list[ScrapedPick], last_update: str = None):
         self.book_name = book_name
-        self.last_update = datetime.now().isoformat()
+        # When the picks were scraped, a book reused from an earlier cycle keeps its time
+        self.last_update = last_update or datetime.now().isoformat()
         self.picks = picks
 
     def to_dict(self):
@@ -0,0 +1,173 @@
+from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures.process import BrokenProcessPool
+from utils import logger
+import multiprocessing
+import threading
+import time
+
+from .base_scraper import BaseScraper
+from .cache import ParseCache
+from .models import ScrapedPick
+
+def _timed_parse(book_scraper: BaseScraper, league, event, blocks):
+    # Runs inside a worker process, so the parse time is measured there as well
+    start_time = time.perf_counter()
+    picks = [book_scraper.parse_block(league, event, html) for html in blocks]
+    return picks, time.perf_counter() - start_time
+
+class StageStats:
+    '''
+    Tracks how many items a pipeline stage handled and how long it spent on them.
+    '''
+
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed, items=1):
+        with self._lock:
+            self.items += items
+            self.busy_time += elapsed
+
+    def reset(self):
+        with self._lock:
+            self.items = 0
+            self.busy_time = 0.0
+
+    def summary(self, wall_time):
+        '''
+        Formats the throughput of this stage.
+
+        Args:
+            wall_time (float): Wall-clock seconds the whole pipeline ran for.
+
+        Returns:
+            str: Items handled, average time per item and items per wall-clock second.
+        '''
+        avg = self.busy_time / self.items if self.items else 0
+        throughput = self.items / wall_time if wall_time > 0 else 0
+        return (
+            f'{self.name}: {self.items} items, avg {avg:.3f}s/item, '
+            f'{throughput:.2f} items/s'
+        )
+
+class ParserPool:
+    '''
+    Parses fetched event pages in a pool of worker processes.
+
+    Driver threads only fetch raw HTML and hand it to this pool, so BeautifulSoup/lxml
+    parsing no longer competes with the driver threads for the GIL. With zero workers
+    pages are parsed on the calling thread instead. Blocks whose HTML has not changed since
+    an earlier cycle reuse their picks from the `ParseCache` and are not parsed again. A pool
+    broken by a crashed worker is replaced the next time a page is submitted.
+    '''
+
+    def __init__(self, workers, cache_size=0):
+        self.workers = workers
+        self.cache = ParseCache(cache_size)
+        self.fetch_stats = StageStats('fetch')
+        self.parse_stats = StageStats('parse')
+        self._executor_lock = threading.Lock()
+        self._executor = self._create_executor() if workers > 0 else None
+
+    def submit(self, book_scraper: BaseScraper, league, event, page) -> Future:
+        '''
+        Schedules an event page to be parsed.
+
+        Args:
+            book_scraper (BaseScraper): The scraper of the book the page was fetched from.
+            league (str): The league of the event.
+            event (ScrapedEvent): The event information.
+            page (list[str]): The raw HTML returned by `fetch_event_page`.
+
+        Returns:
+            Future: Resolves to the list of picks parsed from the page, or to the error that
+                kept it from being parsed.
+        '''
+        result = Future()
+        block_keys = [ParseCache.hash_block(book_scraper.book_name, league, html) for html in page]
+        page_key = ParseCache.hash_page(block_keys)
+        picks = self.cache.get(page_key, 'page')
+        if picks is not None:
+            # Copy so that nothing attached to this cycle can modify the cached list
+            result.set_result(list(picks))
+            return result
+
+        block_picks = [self.cache.get(key, 'block') for key in block_keys]
+        missing = [i for i, picks in enumerate(block_picks) if picks is None]
+
+        def on_parsed(parsed):
+            for i, picks in zip(missing, parsed):
+                block_picks[i] = picks
+                self.cache.put(block_keys[i], picks)
+            picks = [pick for picks in block_picks for pick in picks]
+            self.cache.put(page_key, picks)
+            return picks
+
+        if not missing:
+            result.set_result(on_parsed([]))
+            return result
+
+        blocks = [page[i] for i in missing]
+        if self._executor is None:
+            try:
+                result.set_result(on_parsed(self._record(_timed_parse(book_scraper, league, event, blocks))))
+            except Exception as e:
+                result.set_exception(e)
+            return result
+
+        def on_done(future: Future):
+            try:
+                result.set_result(on_parsed(self._record(future.result())))
+            except Exception as e:
+                result.set_exception(e)
+
+        try:
+            self._submit_parse(book_scraper, league, event, blocks).add_done_callback(on_done)
+        except Exception as e:
+            result.set_exception(e)
+        return result
+
+    def _create_executor(self):
+        # Drivers run in threads, so avoid forking a process that holds their locks
+        return ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def _submit_parse(self, book_scraper, league, event, blocks) -> Future:
+        executor = self._executor
+        try:
+            return executor.submit(_timed_parse, book_scraper, league, event, blocks)
+        except BrokenProcessPool:
+            with self._executor_lock:
+                # Another thread may have replaced the pool already
+                if self._executor is executor:
+                    logger.warning('Parser pool is broken by a crashed worker, replacing it')
+                    executor.shutdown(wait=False)
+                    self._executor = self._create_executor()
+            return self._executor.submit(_timed_parse, book_scraper, league, event, blocks)
+
+    def log_stats(self, wall_time):
+        hit_ratios = self.cache.hit_ratios()
+        logger.info(
+            f'{self.fetch_stats.summary(wall_time)} | {self.parse_stats.summary(wall_time)} | '
+            f'cache hits: {hit_ratios['page']:.0%} pages, {hit_ratios['block']:.0%} blocks'
+        )
+        self.fetch_stats.reset()
+        self.parse_stats.reset()
+        self.cache.reset_stats()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def _record(self, result) -> list[list[ScrapedPick]]:
+        picks, elapsed = result
+        self.parse_stats.record(elapsed)
+        return picks
@@ -0,0 +1,160 @@
+from datetime import datetime, timedelta
+from config import Config
+from utils import logger
+import threading
+import time
+
+from .models import ScrapedEvent, ScrapedBook
+
+class EventState:
+    '''
+    What the refresh policy remembers about one event on one book.
+    '''
+
+    def __init__(self):
+        self.last_scraped = None
+        self.interval = 0.0
+        self.volatility = 0.0
+        self.book: ScrapedBook = None
+        self.odds = {}
+
+class RefreshPolicy:
+    '''
+    Decides how often each event is scraped on each book.
+
+    Every (book, event) gets a refresh interval from its live state and time to start,
+    shortened when its odds have been moving. Events that are not due this cycle reuse the
+    book scraped last time, so driver capacity goes to the events whose prices actually move.
+    '''
+
+    # Weight of the latest scrape in the odds volatility moving average
+    VOLATILITY_ALPHA = 0.3
+    SOON_WINDOW = timedelta(hours=1)
+    TODAY_WINDOW = timedelta(hours=24)
+
+    def __init__(self, live_interval, soon_interval, today_interval, later_interval):
+        self.live_interval = live_interval
+        self.soon_interval = soon_interval
+        self.today_interval = today_interval
+        self.later_interval = later_interval
+        # (book, event id) -> EventState
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def base_interval(self, event: ScrapedEvent, now: datetime = None):
+        '''
+        Returns the refresh interval of an event before accounting for volatility.
+        '''
+        now = now or datetime.now()
+        if event.active:
+            return self.live_interval
+
+        time_to_start = event.start_time - now
+        if time_to_start <= self.SOON_WINDOW:
+            return self.soon_interval
+        if time_to_start <= self.TODAY_WINDOW:
+            return self.today_interval
+        return self.later_interval
+
+    def interval(self, book, event: ScrapedEvent, now: datetime = None):
+        '''
+        Returns the refresh interval of an event, shortened by up to 80% when its odds are volatile.
+        '''
+        state = self._states.get((book, event.id))
+        volatility = state.volatility if state else 0.0
+        return self.base_interval(event, now) * (1 - 0.8 * volatility)
+
+    def is_due(self, book, event: ScrapedEvent):
+        state = self._states.get((book, event.id))
+        if state is None or state.book is None:
+            return True
+        return time.time() - state.last_scraped >= self.interval(book, event)
+
+    def urgency(self, book, event: ScrapedEvent):
+        '''
+        Ranks due events, returning a value in [0, 1] where events that are most overdue
+        relative to their interval are closest to 1.
+        '''
+        state = self._states.get((book, event.id))
+        if state is None or state.last_scraped is None:
+            return 1.0
+
+        interval = self.interval(book, event)
+        staleness = time.time() - state.last_scraped
+        return staleness / (staleness + interval) if staleness + interval > 0 else 1.0
+
+    def cached_book(self, book, event: ScrapedEvent) -> ScrapedBook | None:
+        state = self._states.get((book, event.id))
+        return state.book if state else None
+
+    def record(self, book, event: ScrapedEvent, scraped_book: ScrapedBook):
+        '''
+        Stores a freshly scraped book and updates the odds volatility of the event.
+
+        Volatility is a moving average of the fraction of picks that were added, removed
+        or changed price since the previous scrape.
+        '''
+        odds = {
+            (p.market, p.team, p.line, p.outcome, p.player): p.odds for p in scraped_book.picks
+        }
+        with self._lock:
+            state = self._states.setdefault((book, event.id), EventState())
+            if state.last_scraped is not None:
+                keys = odds.keys() | state.odds.keys()
+                changed = sum(1 for k in keys if odds.get(k) != state.odds.get(k))
+                change_ratio = changed / len(keys) if keys else 0.0
+                state.volatility += self.VOLATILITY_ALPHA * (change_ratio - state.volatility)
+
+            state.last_scraped = time.time()
+            state.interval = self.interval(book, event)
+            state.book = scraped_book
+            state.odds = odds
+
+    def prune(self, events: list[ScrapedEvent]):
+        '''
+        Forgets every event that is no longer on the schedule.
+        '''
+        event_ids = {event.id for event in events}
+        with self._lock:
+            for key in [key for key in self._states if key[1] not in event_ids]:
+                del self._states[key]
+
+    def staleness(self):
+        '''
+        Returns how long ago each event was scraped on each book.
+
+        Returns:
+            dict: `(book, event id)` -> dict with the `staleness` and refresh `interval` in seconds,
+                and the `volatility` of the event's odds.
+        '''
+        now = time.time()
+        with self._lock:
+            return {
+                key: {
+                    'staleness': now - state.last_scraped,
+                    'interval': state.interval,
+                    'volatility': state.volatility,
+                }
+                for key, state in self._states.items() if state.last_scraped is not None
+            }
+
+    def log_staleness(self):
+        metrics = self.staleness()
+        if not metrics:
+            return
+
+        staleness = [m['staleness'] for m in metrics.values()]
+        overdue = sum(1 for m in metrics.values() if m['staleness'] > m['interval'])
+        logger.info(
+            f'Staleness: {len(metrics)} events, avg {sum(staleness) / len(staleness):.1f}s, '
+            f'max {max(staleness):.1f}s, {overdue} overdue'
+        )
+
+    @classmethod
+    def from_config(cls):
+        return cls(
+            Config.LIVE_REFRESH_INTERVAL,
+            Config.SOON_REFRESH_INTERVAL,
+            Config.TODAY_REFRESH_INTERVAL,
+            Config.LATER_REFRESH_INTERVAL,
+        )
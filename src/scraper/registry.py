@@ -0,0 +1,48 @@
+from collections import defaultdict
+
+from .models import ScrapedEvent, EVENT_TIME_TOLERANCE
+
+class EventRegistry:
+    '''
+    The events of a cycle, indexed for constant time matching.
+
+    Events are indexed by (league, away team, home team) and a start time bucket as wide
+    as `EVENT_TIME_TOLERANCE`, so any event within the tolerance of another is in the same
+    or a neighbouring bucket. A lookup only compares against those few candidates instead
+    of scanning every event.
+    '''
+
+    def __init__(self, events: list[ScrapedEvent] = ()):
+        self._events = []
+        self._index = defaultdict(list)
+        for event in events:
+            self.add(event)
+
+    def add(self, event: ScrapedEvent):
+        self._events.append(event)
+        self._index[self._key(event)].append(event)
+
+    def find(self, event: ScrapedEvent) -> ScrapedEvent | None:
+        '''
+        Returns the registered event equal to the given one, or None if there is none.
+        '''
+        league, away_team, home_team, bucket = self._key(event)
+        for b in (bucket - 1, bucket, bucket + 1):
+            for candidate in self._index.get((league, away_team, home_team, b), ()):
+                if candidate == event:
+                    return candidate
+        return None
+
+    def __contains__(self, event):
+        return isinstance(event, ScrapedEvent) and self.find(event) is not None
+
+    def __iter__(self):
+        return iter(self._events)
+
+    def __len__(self):
+        return len(self._events)
+
+    @staticmethod
+    def _key(event: ScrapedEvent):
+        bucket = int(event.start_time.timestamp() // EVENT_TIME_TOLERANCE.total_seconds())
+        return event.league, event.away_team, event.home_team, bucket
@@ -0,0 +1,80 @@
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.chromium.webdriver import ChromiumDriver
+from config import Config
+from utils import logger, RESOURCE_PROFILES, BOOK_RESOURCE_RULES
+import threading
+import weakref
+
+# Book whose rules are currently applied to each driver, so CDP is only called when it changes
+_applied_rules = weakref.WeakKeyDictionary()
+_applied_rules_lock = threading.Lock()
+
+PAGE_METRICS_SCRIPT = '''
+    const navigation = performance.getEntriesByType('navigation')[0];
+    const resources = performance.getEntriesByType('resource');
+    return {
+        bytes: (navigation ? navigation.transferSize : 0)
+            + resources.reduce((total, resource) => total + (resource.transferSize || 0), 0),
+        requests: resources.length + 1,
+        load_ms: navigation ? navigation.duration : 0,
+    };
+'''
+
+def get_blocked_urls(book=None, profile=None):
+    '''
+    Builds the list of URL patterns to block for a book.
+
+    Args:
+        book (str, optional): The book being scraped, or `espn` for the schedule pages.
+        profile (str, optional): The resource blocking profile. Defaults to `Config.BLOCK_RESOURCES`.
+
+    Returns:
+        list[str]: URL patterns in the `Network.setBlockedURLs` wildcard format.
+
+    Raises:
+        KeyError: If the profile does not exist in the `RESOURCE_PROFILES` dictionary.
+    '''
+    profile = profile or Config.BLOCK_RESOURCES
+    rules = BOOK_RESOURCE_RULES.get(book, {})
+    allowed = set(rules.get('allow', []))
+    patterns = [p for p in RESOURCE_PROFILES[profile] if p not in allowed]
+    patterns.extend(p for p in rules.get('deny', []) if p not in patterns)
+    return patterns
+
+def apply_resource_rules(driver: WebDriver, book=None):
+    '''
+    Blocks the resources of the active profile and the book's rules on a Chromium driver.
+
+    Firefox has no equivalent of `Network.setBlockedURLs`, so its blocking is configured
+    once through preferences in `Config.get_driver` and per-book rules are not applied.
+
+    Args:
+        driver (WebDriver): The driver about to load a page of the book.
+        book (str, optional): The book being scraped, or `espn` for the schedule pages.
+    '''
+    if Config.BLOCK_RESOURCES == 'none' or not isinstance(driver, ChromiumDriver):
+        return
+
+    with _applied_rules_lock:
+        if _applied_rules.get(driver, False) == book:
+            return
+
+    patterns = get_blocked_urls(book)
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    except Exception as e:
+        logger.warning(f'{type(e).__name__} encountered while blocking resources for `{book}`: {e}')
+        return
+
+    with _applied_rules_lock:
+        _applied_rules[driver] = book
+
+def get_page_metrics(driver: WebDriver):
+    '''
+    Reads how many bytes the current page transferred and how long it took to load.
+
+    Returns:
+        dict: `bytes` transferred, number of `requests` and `load_ms` of the navigation.
+    '''
+    return driver.execute_script(PAGE_METRICS_SCRIPT)
@@ -0,0 +1,254 @@
+from selenium.webdriver.remote.webdriver import WebDriver
+from concurrent.futures import Future, wait
+from collections import defaultdict
+from queue import PriorityQueue, Queue
+from utils import logger
+import itertools
+import threading
+import time
+
+from .base_scraper import BaseScraper
+from .cache import ScheduleCache, EventUrlCache
+from .driver_pool import DriverPool
+from .models import ScrapedEvent, ScrapedBook
+from .parser_pool import ParserPool
+from .priority import RefreshPolicy
+from .registry import EventRegistry
+
+class ScrapeScheduler:
+    '''
+    Runs schedule discovery, event URL discovery and event page scraping as independent
+    tasks over one shared driver pool.
+
+    Every (league, book) pair is broken into small tasks that are pulled from a single
+    priority queue by one worker per driver. Discovery tasks run first because they unlock
+    more work, so while one driver is loading a book's league page the others are already
+    scraping event pages of another league or book. Event pages are only fetched on the
+    driver threads and handed to the `ParserPool` to be parsed. With a `RefreshPolicy`, events
+    that are not due are skipped and the most overdue events are scraped first.
+
+    Parsed and reused books are merged into the schedule on one merge thread owned by the
+    scheduler, never on the thread that resolved the parse, which for a process pool is the
+    executor's own thread that delivers every other result. `on_book` is called there with
+    the matched event and the book as soon as each book is merged, one call at a time, so
+    results can be consumed before the whole cycle is finished.
+    '''
+
+    # Lower priorities are pulled from the queue first
+    SCHEDULE_PRIORITY = 0
+    EVENT_URLS_PRIORITY = 1
+    EVENT_PRIORITY = 2
+
+    def __init__(
+        self, pool: DriverPool, leagues, book_scrapers: dict[str, BaseScraper], parser: ParserPool,
+        schedule_cache: ScheduleCache = None, event_url_cache: EventUrlCache = None,
+        refresh_policy: RefreshPolicy = None, on_book=None,
+    ):
+        self.pool = pool
+        self.parser = parser
+        self.schedule_cache = schedule_cache
+        self.event_url_cache = event_url_cache
+        self.refresh_policy = refresh_policy
+        self.on_book = on_book
+        self.leagues = leagues
+        self.book_scrapers = book_scrapers
+        self._tasks = PriorityQueue()
+        # Keeps tasks with the same priority in FIFO order
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        # (function, args) of every merge, None stops the merge thread
+        self._merges = Queue()
+        self._league_events = {}
+        self._timings = defaultdict(list)
+        self._pending_parses = []
+
+    def run(self) -> list[ScrapedEvent]:
+        '''
+        Scrapes every league and book and blocks until all tasks are finished.
+
+        Returns:
+            list[ScrapedEvent]: The scheduled events of every league with the picks of each book attached.
+        '''
+        start_time = time.time()
+        merger = threading.Thread(target=self._merge_work, name='scrape-merger', daemon=True)
+        merger.start()
+        for league in self.leagues:
+            events = self.schedule_cache.get(league) if self.schedule_cache else None
+            if events is None:
+                self._submit(self.SCHEDULE_PRIORITY, self._scrape_schedule, league)
+            else:
+                logger.info(f'Using cached schedule for league `{league}`')
+                self._schedule_scraped(league, events)
+
+        workers = [
+            threading.Thread(target=self._work, name=f'scrape-worker-{i + 1}', daemon=True)
+            for i in range(max(len(self.pool), 1))
+        ]
+        for worker in workers:
+            worker.start()
+
+        self._tasks.join()
+        for _ in workers:
+            self._tasks.put((float('inf'), next(self._sequence), None, ()))
+        for worker in workers:
+            worker.join()
+        wait(self._pending_parses)
+        # Every merge was queued before this, reused books by the workers and parses before they resolved
+        self._merges.put(None)
+        merger.join()
+
+        self._log_timings(time.time() - start_time)
+        events = [event for league in self.leagues for event in self._league_events.get(league, [])]
+        if self.refresh_policy:
+            self.refresh_policy.prune(events)
+            self.refresh_policy.log_staleness()
+        return events
+
+    def _submit(self, priority, task, *args):
+        self._tasks.put((priority, next(self._sequence), task, args))
+
+    def _work(self):
+        while True:
+            _, _, task, args = self._tasks.get()
+            if task is None:
+                self._tasks.task_done()
+                break
+
+            try:
+                with self.pool.driver() as driver:
+                    start_time = time.perf_counter()
+                    task(driver, *args)
+                    elapsed = time.perf_counter() - start_time
+                with self._lock:
+                    self._timings[task.__name__].append(elapsed)
+            except Exception as e:
+                logger.error(f'{type(e).__name__} encountered in task `{task.__name__}` {args}: {e}')
+            finally:
+                # Follow-up tasks are submitted before this, so `join` cannot return early
+                self._tasks.task_done()
+
+    def _merge_work(self):
+        while True:
+            merge = self._merges.get()
+            if merge is None:
+                break
+            function, args = merge
+            try:
+                function(*args)
+            except Exception as e:
+                # The thread must outlive a failed merge, `run` waits on the ones after it
+                logger.error(f'{type(e).__name__} encountered in merge `{function.__name__}` {args}: {e}')
+
+    def _scrape_schedule(self, driver: WebDriver, league):
+        logger.info(f'Scraping league `{league}`')
+        events = BaseScraper.scrape_scheduled_events(league, driver)
+        if self.schedule_cache:
+            self.schedule_cache.put(league, events)
+        self._schedule_scraped(league, events)
+
+    def _schedule_scraped(self, league, events):
+        events = EventRegistry(events)
+        with self._lock:
+            self._league_events[league] = events
+
+        for book in self.book_scrapers:
+            event_urls = self.event_url_cache.get(book, league, events) if self.event_url_cache else None
+            if event_urls is None:
+                self._submit(self.EVENT_URLS_PRIORITY, self._scrape_event_urls, league, book)
+            else:
+                logger.info(f'Using {len(event_urls)} cached event URLs in `{book}` for league `{league}`')
+                self._event_urls_scraped(league, book, event_urls)
+
+    def _scrape_event_urls(self, driver: WebDriver, league, book):
+        logger.info(f'Scraping book `{book}` for league `{league}`')
+        book_scraper = self.book_scrapers[book]
+        event_urls = book_scraper.scrape_event_urls(league, self._league_events[league], driver)
+        logger.info(f'Found {len(event_urls)} events in `{book}` for league `{league}`')
+        if self.event_url_cache:
+            self.event_url_cache.put(book, league, self._league_events[league], event_urls)
+        self._event_urls_scraped(league, book, event_urls)
+
+    def _event_urls_scraped(self, league, book, event_urls):
+        reused = 0
+        for event, url in event_urls:
+            if self.refresh_policy is None:
+                self._submit(self.EVENT_PRIORITY, self._scrape_event, league, book, event, url)
+                continue
+
+            # Freshly scraped URLs carry the book's version of the event, cached ones the schedule's,
+            # the refresh state is always kept under the schedule's so both find the same state
+            scheduled = self._league_events[league].find(event) or event
+            if self.refresh_policy.is_due(book, scheduled):
+                # Most overdue events first, still after every discovery task
+                priority = self.EVENT_PRIORITY + 1 - self.refresh_policy.urgency(book, scheduled)
+                self._submit(priority, self._scrape_event, league, book, event, url)
+            else:
+                self._merges.put((self._reuse_book, (league, book, scheduled)))
+                reused += 1
+
+        if reused:
+            logger.info(f'Reusing {reused} events in `{book}` for league `{league}` that are not due')
+
+    def _reuse_book(self, league, book, event):
+        try:
+            cached = self.refresh_policy.cached_book(book, event)
+            # A new book of this cycle, so the cycles' events do not share one, but with the time
+            # its picks were scraped so their age stays visible downstream
+            scraped_book = ScrapedBook(cached.book_name, cached.picks, cached.last_update)
+            with self._lock:
+                BaseScraper._add_book_to_matching_event(event, self._league_events[league], scraped_book)
+            self._book_merged(league, event, scraped_book)
+        except ValueError as e:
+            logger.error(f'Unable to reuse `{event}` in `{book}`: {e}')
+
+    def _book_merged(self, league, event, scraped_book):
+        if self.on_book is None:
+            return
+        # The callback gets the schedule's event, the same one `run` returns
+        match = self._league_events[league].find(event)
+        try:
+            self.on_book(match, scraped_book)
+        except Exception as e:
+            logger.error(f'{type(e).__name__} encountered while streaming `{event}` in `{scraped_book.book_name}`: {e}')
+
+    def _scrape_event(self, driver: WebDriver, league, book, event, url):
+        logger.info(f'Scraping event `{event}` in `{book}`')
+        book_scraper = self.book_scrapers[book]
+        start_time = time.perf_counter()
+        page = book_scraper.fetch_event_page(league, event, url, driver)
+        self.parser.fetch_stats.record(time.perf_counter() - start_time)
+
+        # Resolved once the picks are merged, so `run` does not return before the callback finishes
+        merged = Future()
+
+        def merge(future: Future):
+            try:
+                picks = future.result()
+                with self._lock:
+                    scraped_book = book_scraper._add_picks_to_matching_event(
+                        event, self._league_events[league], picks
+                    )
+                if self.refresh_policy:
+                    scheduled = self._league_events[league].find(event) or event
+                    self.refresh_policy.record(book, scheduled, scraped_book)
+                self._book_merged(league, event, scraped_book)
+                logger.debug(f'Scraped event `{event}` in `{book}` in {time.perf_counter() - start_time:.2f}s')
+            except Exception as e:
+                logger.error(f'{type(e).__name__} encountered while processing `{event}` in `{book}`: {e}')
+            finally:
+                merged.set_result(None)
+
+        parsed = self.parser.submit(book_scraper, league, event, page)
+        # Only waited on once submitted, a page that failed to submit would never be merged
+        with self._lock:
+            self._pending_parses.append(merged)
+        parsed.add_done_callback(lambda future: self._merges.put((merge, (future,))))
+
+    def _log_timings(self, total):
+        for name, timings in self._timings.items():
+            logger.info(
+                f'{name}: {len(timings)} tasks, avg {sum(timings) / len(timings):.2f}s, '
+                f'slowest {max(timings):.2f}s'
+            )
+        logger.info(f'Scheduler finished in {total:.2f}s using {len(self.pool)} drivers')
+        self.parser.log_stats(total)
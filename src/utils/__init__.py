@@ -6,8 +6,11 @@ from .common import (
     BOOK_REGIONS,
     SCHEDULE_BASE_URL,
     BOOK_BASE_URL,
+    RESOURCE_PROFILES,
+    BOOK_RESOURCE_RULES,
     MARKETS,
     MARKET_MAPPINGS,
+    OPPOSITE_OUTCOMES,
     TEAM_ACRONYMS,
 )
 from .exceptions import (
@@ -29,9 +32,12 @@ __all__ = [
     'BOOK_REGIONS',
     'SCHEDULE_BASE_URL',
     'BOOK_BASE_URL',
+    'RESOURCE_PROFILES',
+    'BOOK_RESOURCE_RULES',
     'TEAM_ACRONYMS',
     'MARKETS',
     'MARKET_MAPPINGS',
+    'OPPOSITE_OUTCOMES',
     'ScraperError',
     'LeagueNotFoundError',
     'EventNotFoundError',
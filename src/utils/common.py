@@ -38,6 +38,37 @@ BOOK_BASE_URL = {
 	'espnbet': {},
 }
 
+# URL patterns blocked by each resource blocking profile. None of these affect the odds DOM.
+RESOURCE_PROFILES = {
+	'none': [],
+	'media': [
+		'*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+		'*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+		'*.mp4', '*.webm', '*.m3u8', '*.mp3',
+	],
+	'aggressive': [
+		'*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+		'*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+		'*.mp4', '*.webm', '*.m3u8', '*.mp3',
+		'*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+		'*googlesyndication.com*', '*facebook.net*', '*hotjar.com*', '*newrelic.com*',
+		'*nr-data.net*', '*optimizely.com*', '*segment.io*', '*adsrvr.org*', '*quantserve.com*',
+	],
+}
+
+# Per-book adjustments to the active profile. `allow` removes patterns from the profile
+# and `deny` blocks additional patterns while scraping that book.
+BOOK_RESOURCE_RULES = {
+	'espn': {
+		'allow': [],
+		'deny': ['*cdn.registerdisney.go.com*'],
+	},
+	'betmgm': {
+		'allow': [],
+		'deny': ['*livechat*'],
+	},
+}
+
 MARKETS = {
 	# General Game Lines
 	'moneyline', 'spread', 'total',
@@ -1042,6 +1073,16 @@ MARKET_MAPPINGS = {
     'futures': 'futures',
 }
 
+# Outcomes of two-way markets and the outcome that loses when they win
+OPPOSITE_OUTCOMES = {
+    'over': 'under',
+    'under': 'over',
+    'yes': 'no',
+    'no': 'yes',
+    'odd': 'even',
+    'even': 'odd',
+}
+
 TEAM_ACRONYMS = {
     'nba': {
         'ATLANTA HAWKS': 'ATL', 'ATLANTA': 'ATL', 'HAWKS': 'ATL', 'ATL': 'ATL',